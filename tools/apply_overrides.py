@@ -1,5 +1,5 @@
 # tools/apply_overrides.py
-import csv, argparse
+import csv, argparse, os
 
 def main():
     ap = argparse.ArgumentParser()
@@ -24,9 +24,9 @@ def main():
 
     changed = 0
     for r in rows:
-        k = key(r)
-        if k in o_map:
-            o = o_map[k]
+        # one dict probe per row (membership test and fetch in one)
+        o = o_map.get(key(r))
+        if o is not None:
             if o.get("page_url"):
                 r["page_url"] = o["page_url"]
             if o.get("pdf_url"):
@@ -34,10 +34,14 @@ def main():
             r["verified_source"] = r.get("verified_source") or "manual"
             changed += 1
 
-    with open(args.cases, "w", newline="", encoding="utf-8") as f:
+    # --cases is rewritten in place: write a sibling temp file and rename it
+    # over the original, so an interrupted run can't leave it truncated
+    tmp = args.cases + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=fieldnames)
         w.writeheader()
         w.writerows(rows)
+    os.replace(tmp, args.cases)
 
     print(f"Applied {changed} manual override(s).")
 
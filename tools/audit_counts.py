@@ -16,11 +16,15 @@ def read_csv_titles(p, title_key="Title"):
     if not Path(p).exists():
         return set(), []
     rows = []
+    titles = set()
     with open(p, "r", newline="", encoding="utf-8") as f:
         r = csv.DictReader(f)
         for row in r:
             rows.append(row)
-    titles = set([row.get(title_key,"").strip() for row in rows if row.get(title_key,"").strip()])
+            # each title is looked up and stripped once, in the same pass
+            t = row.get(title_key,"").strip()
+            if t:
+                titles.add(t)
     return titles, rows
 
 def read_ltj_count(report_json):
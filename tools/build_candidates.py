@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
-import argparse, json, sys, pathlib
+import argparse, json, re, sys, pathlib
+
+# Snippet keywords that make a case citation a "breach" candidate. One
+# alternation, so each snippet is scanned once instead of once per keyword
+# ("breach of trust" is kept for readability; "breach" already covers it).
+KEYWORDS = ("breach of trust", "fiduciary", "breach", "duty", "misappropriation")
+KEYWORD_RE = re.compile("|".join(map(re.escape, KEYWORDS)))
 
 def load_json(path: str):
     p = pathlib.Path(path)
     if not p.exists():
         sys.exit(f"ERROR: Missing file {path}")
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    # bytes straight to the parser: no intermediate str copy of the file
+    return json.loads(p.read_bytes())
 
 def main():
     ap = argparse.ArgumentParser()
@@ -24,24 +30,24 @@ def main():
     # Very conservative candidate builder:
     # Treat any citation record whose "authority_kind" is "case" and
     # whose snippet includes keywords as a "breach" candidate.
-    KEYWORDS = {"breach of trust", "fiduciary", "breach", "duty", "misappropriation"}
     candidates = []
     for c in citations if isinstance(citations, list) else []:
-        if str(c.get("authority_kind", "")).lower() != "case":
+        get = c.get  # bound once per record; used for every field below
+        if str(get("authority_kind", "")).lower() != "case":
             continue
-        snippet = (c.get("snippet") or "").lower()
-        if any(k in snippet for k in KEYWORDS):
+        snippet = (get("snippet") or "").lower()
+        if KEYWORD_RE.search(snippet):
             candidates.append({
                 "phrase": "breach",                # normalized label
                 "normalized": "breach",
                 "polarity": "breach",
-                "jurisdiction": c.get("jurisdiction"),
-                "pid": c.get("from_pid") or c.get("pid"),
-                "authority_id": c.get("to") or c.get("authority_id"),
-                "authority_label": c.get("to_label") or c.get("authority_label"),
-                "snippet": c.get("snippet", ""),
-                "cues": [c.get("cue")] if c.get("cue") else [],
-                "statutes": c.get("statutes", []),
+                "jurisdiction": get("jurisdiction"),
+                "pid": get("from_pid") or get("pid"),
+                "authority_id": get("to") or get("authority_id"),
+                "authority_label": get("to_label") or get("authority_label"),
+                "snippet": get("snippet", ""),
+                "cues": [get("cue")] if get("cue") else [],
+                "statutes": get("statutes", []),
             })
 
     outp = pathlib.Path(args.out)
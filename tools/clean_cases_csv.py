@@ -8,13 +8,14 @@ IN = Path("data/cases.csv")
 OUT = IN
 
 CASE_COLS = ["case_id", "title", "citation", "jurisdiction", "url", "source_line"]
-NUMERIC_INDEX_RE = re.compile(r"^\s*(\d+(?:\s*-\s*\d+)?)(\s*,\s*\d+(?:\s*-\s*\d+)?)*\s*$")
 TRAILING_PAGES_RE = re.compile(r"[,;]\s*(?:pp?\.\s*)?\d+(?:-\d+)?(?:\s*,\s*\d+(?:-\d+)?)*\s*$", re.IGNORECASE)
+ASCII_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
 
 def keep(title: str) -> bool:
-    if NUMERIC_INDEX_RE.match(title.strip()): return False
-    if not re.search(r"[A-Za-z]", title):     return False
-    return True
+    # A title needs at least one ASCII letter. That alone also rejects numeric
+    # index rows like "12-23, 45" (digits, dashes, commas only), which used to
+    # get their own regex pass. One C-level set test, no regex.
+    return not ASCII_LETTERS.isdisjoint(title)
 
 def main():
     if not IN.exists():
@@ -22,19 +23,26 @@ def main():
         return
     rows = []
     with IN.open("r", encoding="utf-8", newline="") as f:
-        r = csv.DictReader(f)
+        r = csv.reader(f)
+        # positions of CASE_COLS in this file's header (None = column absent);
+        # rows stay lists, no dict is built per row
+        pos = {name: i for i, name in enumerate(next(r, []))}
+        cols = [pos.get(c) for c in CASE_COLS]
+        title_at = CASE_COLS.index("title")
         for row in r:
-            t = (row.get("title") or "").strip()
+            if not row:
+                continue
+            n = len(row)
+            vals = [row[i] if i is not None and i < n else "" for i in cols]
+            t = vals[title_at].strip()
             if not t or not keep(t): 
                 continue
-            t = TRAILING_PAGES_RE.sub("", t).rstrip(" ,;").strip()
-            row["title"] = t
-            rows.append({c: row.get(c, "") for c in CASE_COLS})
+            vals[title_at] = TRAILING_PAGES_RE.sub("", t).rstrip(" ,;").strip()
+            rows.append(vals)
     with OUT.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=CASE_COLS)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w = csv.writer(f)
+        w.writerow(CASE_COLS)
+        w.writerows(rows)
     print(f"Cleaned {len(rows)} rows -> {OUT}")
 
 if __name__ == "__main__":
@@ -17,15 +17,19 @@ REPORT = "out/clean_report.json"
 COLS = ["case_id","Title","Year","Citation","Jurisdiction","Line"]
 OUT_COLS = COLS + ["OriginalTitle","CleanNote"]
 
+# compiled once; clean_title runs for every row
+TRAILING_PAGES_RE = re.compile(r"[-, ]*\d+(?:[-, ]*\d+)*\s*$")
+MULTI_SPACE_RE = re.compile(r"\s{2,}")
+
 def clean_title(title):
     if not title:
         return title, ""
     orig = title
     # remove trailing page refs / number lists at end
-    cleaned = re.sub(r"[-, ]*\d+(?:[-, ]*\d+)*\s*$", "", title).strip()
+    cleaned = TRAILING_PAGES_RE.sub("", title).strip()
     note = "stripped trailing page refs" if cleaned != orig else ""
     # normalize spaces
-    cleaned2 = re.sub(r"\s{2,}", " ", cleaned)
+    cleaned2 = MULTI_SPACE_RE.sub(" ", cleaned)
     if cleaned2 != cleaned and not note:
         note = "normalized spaces"
     return cleaned2, note
@@ -42,17 +46,16 @@ def main():
             total += 1
             title = row.get("Title","")
             new_title, note = clean_title(title)
-            new_row = {k: row.get(k,"") for k in COLS}
-            new_row["OriginalTitle"] = title
-            new_row["Title"] = new_title
-            new_row["CleanNote"] = note
             if note:
                 changed += 1
-            out_rows.append(new_row)
+            # one tuple per row, in OUT_COLS order
+            out_rows.append((row.get("case_id",""), new_title, row.get("Year",""),
+                             row.get("Citation",""), row.get("Jurisdiction",""),
+                             row.get("Line",""), title, note))
 
     with open(OUT, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=OUT_COLS)
-        w.writeheader()
+        w = csv.writer(f)
+        w.writerow(OUT_COLS)
         w.writerows(out_rows)
 
     with open(REPORT, "w", encoding="utf-8") as f:
@@ -94,11 +94,11 @@ def save_preview(outdir: str, preview_rows: List[Dict[str,str]], debug_json: Lis
     os.makedirs(outdir, exist_ok=True)
     # CSV
     csvpath = os.path.join(outdir, "cases_preview.csv")
+    fields = ["Title","Citation","url"]
     with open(csvpath, "w", newline="", encoding="utf-8") as f:
-        wr = csv.DictWriter(f, fieldnames=["Title","Citation","url"])
-        wr.writeheader()
-        for r in preview_rows:
-            wr.writerow(r)
+        wr = csv.writer(f)
+        wr.writerow(fields)
+        wr.writerows([r.get(k, "") for k in fields] for r in preview_rows)
     # URLs debug JSON
     with open(os.path.join(outdir, "urls_preview.json"), "w", encoding="utf-8") as f:
         json.dump(debug_json, f, indent=2, ensure_ascii=False)
@@ -46,14 +46,13 @@ def main():
         processed += 1
         sleep_jitter(args.sleep_min, args.sleep_max)
 
-    # write back (overwrite is fine for preview too)
-    with open(args.out, "w", newline='', encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for r in rows:
-            # ensure every row has url column
-            if "url" not in r: r["url"] = ""
-            w.writerow(r)
+    # write back (overwrite is fine for preview too); rows are flattened to
+    # lists in field order once and handed to writerows in a single call
+    out_rows = [[r.get(k) or "" for k in fieldnames] for r in rows]
+    with open(args.out, "w", newline='', encoding="utf-8", buffering=1 << 20) as f:
+        w = csv.writer(f)
+        w.writerow(fieldnames)
+        w.writerows(out_rows)
 
     print(f"Done. Updated {processed} rows into {args.out}")
 
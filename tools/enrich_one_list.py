@@ -19,7 +19,7 @@ What it does
 2) Builds search links (DuckDuckGo, BAILII, JerseyLaw).
 3) Attempts to auto-resolve authoritative URLs:
    - Respect an existing URL in the row (no fabrication).
-   - Otherwise try to find a result from JerseyLaw or BAILII via DuckDuckGo (html).
+   - Otherwise try to find a result from JerseyLaw or BAILII via DuckDuckGo.
 4) Optionally fetches the chosen URL and extracts a few safe metadata fields & an
    outcome snippet (verbatim if found; else blank). No generative text.
 5) Emits ONE file: out/cases_enriched.csv
@@ -36,13 +36,17 @@ import html
 import os
 import re
 import sys
+import threading
 import time
+from collections import namedtuple
 import json
 import urllib.parse
-from typing import Dict, List, Tuple, Optional
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Optional
 
-import requests
-from bs4 import BeautifulSoup
+# requests / bs4 / duckduckgo_search are imported where first used, so rows
+# that never reach the network or a parser don't pay their import cost.
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 # ---------------------- Config ----------------------
 
@@ -53,52 +57,96 @@ IN_CSV  = os.environ.get("IN_CSV", "data/cases.csv")
 HTTP_TIMEOUT = 20
 PAUSE_BETWEEN_REQUESTS = 1.0  # seconds
 
-DDG_HTML = "https://html.duckduckgo.com/html/"
-
 HEADERS = {
     "User-Agent": "CourtFirst/0.1 (+https://github.com/; research non-commercial)"
 }
 
+# citation/title tokens that pick a single authoritative source
+JERSEY_HINT = re.compile(r"\b(?:JRC|JLR|JCA|Jersey)\b")
+UK_HINT = re.compile(r"\b(?:EWCA|EWHC|UKHL|UKSC|UKPC|WLR|All ER|AC|QB|Ch|Fam)\b")
+
+# patterns used per fetched page (compiled once)
+_YEAR_RE = re.compile(r"\b([12][0-9]{3})\b")
+_NCIT_RE = re.compile(r"\[[12][0-9]{3}\]\s+[A-Z]{2,}[A-Z0-9]*\s+\d+\b")  # [2014] JRC 123, [2010] UKSC 4
+_H16_RE = re.compile(r"^h[1-6]$")
+# outcome heading keys, matched as substrings ("Conclusions", "Held.", "Orders")
+_KEY_RE = re.compile(r"held|decision|conclusion|judgment|disposition|order")
+
+# output columns of out/cases_enriched.csv
+FIELDS = (
+    "case_id","title","citation","jurisdiction","ltj_refs",
+    "ddg_url","bailii_url","jerseylaw_url","final_url",
+    "fetch_status","http_status","decision_date","court","neutral_citation",
+    "outcome_snippet","notes",
+)
+
 # ----------------------------------------------------
 
+class RateLimiter:
+    """
+    Spaces out real HTTP requests to at most `rate` per second (shared across
+    threads). Callers only pay when they actually hit the network.
+    """
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+LIMITER = RateLimiter(1.0 / PAUSE_BETWEEN_REQUESTS)
+
 def ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
-def read_cases_csv(path: str) -> List[Dict[str, str]]:
+# accepted header names per canonical field (case-insensitive, first non-empty wins)
+FIELD_NAMES = {
+    "case_id":      ("case_id", "id"),
+    "title":        ("title", "case", "name", "raw"),
+    "citation":     ("citation", "cite"),
+    "jurisdiction": ("jurisdiction", "juris"),
+    "ltj_refs":     ("ltj_refs", "ltj", "refs"),
+    "url":          ("url", "source_url"),
+}
+
+Case = namedtuple("Case", FIELD_NAMES)
+
+def read_cases_csv(path: str) -> Iterator[Case]:
+    """Stream normalized rows (see normalize_row) from the input CSV."""
+    # checked here, not on first next(), so a bad path fails before any output is opened
     if not os.path.exists(path):
         raise FileNotFoundError(f"Input CSV not found: {path}")
+    return _iter_cases(path)
+
+def _iter_cases(path: str) -> Iterator[Case]:
     with open(path, newline="", encoding="utf-8") as f:
-        rows = list(csv.DictReader(f))
-    if not rows:
-        return []
-    # normalize keys to lowercase
-    norm = []
-    for r in rows:
-        norm.append({(k or "").strip().lower(): (v or "").strip() for k, v in r.items()})
-    return norm
-
-def pick(r: Dict[str, str], names: List[str]) -> str:
-    for n in names:
-        v = r.get(n)
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            return
+        # normalize the header once, then index rows positionally
+        name2idx = {h.strip().lower(): i for i, h in enumerate(header)}
+        idxs = {field: tuple(name2idx[n] for n in names if n in name2idx)
+                for field, names in FIELD_NAMES.items()}
+        for r in reader:
+            if r:
+                yield normalize_row(r, idxs)
+
+def pick(r: List[str], idxs: Tuple[int, ...]) -> str:
+    for i in idxs:
+        v = r[i].strip() if i < len(r) else ""
         if v:
             return v
     return ""
 
-def normalize_row(r: Dict[str, str]) -> Dict[str, str]:
-    case_id = pick(r, ["case_id","id"])
-    title   = pick(r, ["title","case","name","raw"])
-    citation= pick(r, ["citation","cite"])
-    juris   = pick(r, ["jurisdiction","juris"])
-    ltjrefs = pick(r, ["ltj_refs","ltj","refs"])
-    url     = pick(r, ["url","source_url"])
-    return {
-        "case_id": case_id,
-        "title": title,
-        "citation": citation,
-        "jurisdiction": juris,
-        "ltj_refs": ltjrefs,
-        "url": url
-    }
+def normalize_row(r: List[str], idxs: Dict[str, Tuple[int, ...]]) -> Case:
+    return Case._make(pick(r, idxs[field]) for field in FIELD_NAMES)
 
 def build_search_queries(title: str, citation: str) -> Dict[str, str]:
     # conservative query strings
@@ -112,53 +160,62 @@ def build_search_queries(title: str, citation: str) -> Dict[str, str]:
         terms.append(f'"{title}"')
     q = " ".join(terms) if terms else q_core
 
-    ddg_q = q
-    ddg = f"{DDG_HTML}?q={urllib.parse.quote(ddg_q)}"
-
-    ddg_bailii = f"{DDG_HTML}?q={urllib.parse.quote('site:bailii.org ' + q)}"
-    ddg_jl     = f"{DDG_HTML}?q={urllib.parse.quote('site:jerseylaw.je ' + q)}"
-
     return {
-        "ddg": ddg,
-        "ddg_bailii": ddg_bailii,
-        "ddg_jerseylaw": ddg_jl,
+        "ddg": q,
+        "ddg_bailii": "site:bailii.org " + q,
+        "ddg_jerseylaw": "site:jerseylaw.je " + q,
     }
 
-def ddg_first_result(url: str, prefer_domains: Tuple[str,...]=()) -> Optional[str]:
+_DDGS = None
+
+def ddg_client():
+    """One DDGS client per run, so its HTTP session and cookies are reused across queries."""
+    global _DDGS
+    if _DDGS is None:
+        from duckduckgo_search import DDGS  # local import to keep startup light
+        _DDGS = DDGS()
+    return _DDGS
+
+def ddg_first_result(query: str, prefer_domains: Tuple[str,...]=()) -> Optional[str]:
     """
-    Returns first result URL from DuckDuckGo HTML (no JS).
+    Returns first result URL for a DuckDuckGo query (duckduckgo_search; structured
+    results, no HTML parsing).
     If prefer_domains provided, returns the first result that matches any domain.
     """
     try:
-        resp = requests.post(url, headers=HEADERS, timeout=HTTP_TIMEOUT, data={"kl":"wt-wt"})
-        if resp.status_code != 200:
-            return None
-        soup = BeautifulSoup(resp.text, "html.parser")
-        links = []
-        for a in soup.select("a.result__url, a.result__a"):
-            href = a.get("href") or ""
-            if href.startswith("http"):
-                links.append(href)
-        # new DDG HTML sometimes uses .result__a; fallback scanning:
-        if not links:
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if href.startswith("http"):
-                    links.append(href)
-        if prefer_domains:
-            for href in links:
-                host = urllib.parse.urlparse(href).netloc.lower()
-                if any(dom in host for dom in prefer_domains):
-                    return href
-        return links[0] if links else None
+        ddgs = ddg_client()
+        LIMITER.acquire()
+        links = [r["href"] for r in ddgs.text(query, max_results=10, region="uk-en") if r.get("href")]
     except Exception:
         return None
+    if prefer_domains:
+        # the domain itself or a subdomain of it; a bare substring test would
+        # also accept e.g. "notbailii.org" or "bailii.org.example"
+        suffixes = tuple("." + dom for dom in prefer_domains)
+        for href in links:
+            host = urllib.parse.urlsplit(href).hostname or ""
+            if host in prefer_domains or host.endswith(suffixes):
+                return href
+    return links[0] if links else None
+
+def normalize_url(raw: str) -> Optional[str]:
+    """Give a user-supplied URL a scheme: '//host/..' and bare 'host/..' become https."""
+    s = raw.strip()
+    if not s:
+        return None
+    head = s[:8].lower()
+    if head.startswith("//"):
+        return "https:" + s
+    if not head.startswith(("http://", "https://")):
+        return "https://" + s
+    return s
 
 def resolve_urls(title: str, citation: str, existing_url: str) -> Tuple[Optional[str], Optional[str], Optional[str], Optional[str], str]:
     """
     Return bailii_url, jerseylaw_url, ddg_url, final_url, notes
     """
     notes = []
+    existing_url = normalize_url(existing_url)
     if existing_url:
         # Trust user-provided URL most
         final_url = existing_url
@@ -170,12 +227,23 @@ def resolve_urls(title: str, citation: str, existing_url: str) -> Tuple[Optional
         return bailii, jl, ddg, final_url, "; ".join(notes) if notes else ""
 
     qs = build_search_queries(title, citation)
-    # Prefer domain-specific first:
-    bailii = ddg_first_result(qs["ddg_bailii"], prefer_domains=("bailii.org",))
-    time.sleep(PAUSE_BETWEEN_REQUESTS)
-    jl = ddg_first_result(qs["ddg_jerseylaw"], prefer_domains=("jerseylaw.je",))
-    time.sleep(PAUSE_BETWEEN_REQUESTS)
-    ddg_any = ddg_first_result(qs["ddg"])
+    bailii = jl = ddg_any = None
+    # A Jersey/UK citation tells us which site to ask; only fall back to the
+    # open query if that one misses. Rows without a hint try every source.
+    hint = f"{citation} {title}"
+    if JERSEY_HINT.search(hint):
+        jl = ddg_first_result(qs["ddg_jerseylaw"], prefer_domains=("jerseylaw.je",))
+        if not jl:
+            ddg_any = ddg_first_result(qs["ddg"])
+    elif UK_HINT.search(hint):
+        bailii = ddg_first_result(qs["ddg_bailii"], prefer_domains=("bailii.org",))
+        if not bailii:
+            ddg_any = ddg_first_result(qs["ddg"])
+    else:
+        # Prefer domain-specific first:
+        bailii = ddg_first_result(qs["ddg_bailii"], prefer_domains=("bailii.org",))
+        jl = ddg_first_result(qs["ddg_jerseylaw"], prefer_domains=("jerseylaw.je",))
+        ddg_any = ddg_first_result(qs["ddg"])
 
     final_url = jl or bailii or ddg_any
     ddg = ddg_any
@@ -189,7 +257,9 @@ def fetch_once(url: str) -> Tuple[str, int, Optional[str]]:
     """
     Fetch a single page. Returns (status, http_code, html_text or None)
     """
+    import requests  # local import to keep startup light
     try:
+        LIMITER.acquire()
         resp = requests.get(url, headers=HEADERS, timeout=HTTP_TIMEOUT)
         code = resp.status_code
         if 200 <= code < 300 and "text/html" in (resp.headers.get("content-type","").lower()):
@@ -198,7 +268,15 @@ def fetch_once(url: str) -> Tuple[str, int, Optional[str]]:
     except requests.RequestException as e:
         return "error", 0, None
 
-def parse_metadata(html_text: str) -> Dict[str,str]:
+def parse_html(html_text: str) -> BeautifulSoup:
+    from bs4 import BeautifulSoup  # local import to keep startup light
+    return BeautifulSoup(html_text, "html.parser")
+
+def _year_from_attr(value: str) -> str:
+    m = _YEAR_RE.search(value or "")
+    return m.group(1) if m else ""
+
+def parse_metadata(soup: BeautifulSoup) -> Dict[str,str]:
     """
     Super-conservative metadata parser:
     - tries to pick up neutral citation, court, date
@@ -206,19 +284,24 @@ def parse_metadata(html_text: str) -> Dict[str,str]:
     (No hallucination: only regex/DOM extraction)
     """
     out = {"decision_date":"", "court":"", "neutral_citation":""}
-    if not html_text:
-        return out
-    text = " ".join(BeautifulSoup(html_text, "html.parser").stripped_strings)
-    # very basic patterns
-    m = re.search(r"\b([12][0-9]{3})\b", text)
-    if m:
-        out["decision_date"] = m.group(1)  # year only if that's all we can find
+    text = " ".join(soup.stripped_strings)
 
     # neutral citation like [2014] JRC 123 or [2010] UKSC 4
-    m2 = re.search(r"\[[12][0-9]{3}\]\s+[A-Z]{2,}[A-Z0-9]*\s+\d+\b", text)
+    m2 = _NCIT_RE.search(text)
     if m2:
         out["neutral_citation"] = m2.group(0)
 
+    # year: explicit date markup first; otherwise only look next to the neutral
+    # citation (the first year anywhere on the page is usually a footer copyright)
+    node = soup.find("time", attrs={"datetime": True})
+    year = _year_from_attr(node["datetime"]) if node else ""
+    if not year:
+        node = soup.find("meta", attrs={"property": "article:published_time"})
+        year = _year_from_attr(node.get("content", "")) if node else ""
+    if not year and m2:
+        year = _year_from_attr(text[max(0, m2.start() - 200):m2.end() + 200])
+    out["decision_date"] = year  # year only if that's all we can find
+
     # extremely light "court" capture (look near neutral citation)
     if out["neutral_citation"]:
         court_guess = out["neutral_citation"].split()[-2]  # JRC/UKSC/… token
@@ -226,21 +309,17 @@ def parse_metadata(html_text: str) -> Dict[str,str]:
 
     return out
 
-def extract_outcome_snippet(html_text: str) -> str:
+def extract_outcome_snippet(soup: BeautifulSoup) -> str:
     """
     Try to capture a small verbatim outcome/held snippet if the page exposes
     headings like "Held", "Decision", "Conclusion", "Judgment".
     Returns a short string (<= 300 chars) or "".
     """
-    if not html_text:
-        return ""
-    soup = BeautifulSoup(html_text, "html.parser")
     # Look for headings and gather following paragraph
-    heads = soup.find_all(re.compile(r"^h[1-6]$"))
-    keys = ("held", "decision", "conclusion", "judgment", "disposition", "order")
+    heads = soup.find_all(_H16_RE)
     for h in heads:
-        t = (h.get_text() or "").strip().lower()
-        if any(k in t for k in keys):
+        # one compiled scan for any key instead of a substring test per key
+        if _KEY_RE.search(h.get_text().lower()):
             # pick next paragraph-like text
             node = h.find_next(["p","div","span","li"])
             if node:
@@ -252,82 +331,71 @@ def extract_outcome_snippet(html_text: str) -> str:
 
 def main() -> None:
     ensure_dir(OUT_DIR)
+    # rows are streamed: the first lookup starts before the whole CSV is read
     rows = read_cases_csv(IN_CSV)
 
-    out_rows = []
-    for r in rows:
-        base = normalize_row(r)
-        case_id = base["case_id"] or ""
-        title   = base["title"]
-        citation= base["citation"]
-        juris   = base["jurisdiction"]
-        ltjrefs = base["ltj_refs"]
-        existing_url = base["url"]
-
-        bailii, jl, ddg, final_url, notes = resolve_urls(title, citation, existing_url)
-
-        fetch_status = "skipped"
-        http_code = ""
-        decision_date = court = neutral = outcome = ""
-
-        if final_url:
-            status, code, html_text = fetch_once(final_url)
-            fetch_status = status
-            http_code = str(code) if code else ""
-            if status == "ok" and html_text:
-                meta = parse_metadata(html_text)
-                decision_date = meta.get("decision_date","")
-                court = meta.get("court","")
-                neutral = meta.get("neutral_citation","")
-                outcome = extract_outcome_snippet(html_text)
-            elif status != "ok":
-                notes = (notes + "; " if notes else "") + "fetch_failed"
-
-            time.sleep(PAUSE_BETWEEN_REQUESTS)
-        else:
-            # Keep row; mark not found
-            fetch_status = "skipped"
-            http_code = ""
-            notes = (notes + "; " if notes else "") + "no_final_url"
-
-        out_rows.append({
-            "case_id": case_id,
-            "title": title,
-            "citation": citation,
-            "jurisdiction": juris,
-            "ltj_refs": ltjrefs,
-            "ddg_url": ddg or "",
-            "bailii_url": bailii or "",
-            "jerseylaw_url": jl or "",
-            "final_url": final_url or "",
-            "fetch_status": fetch_status,
-            "http_status": http_code,
-            "decision_date": decision_date,
-            "court": court,
-            "neutral_citation": neutral,
-            "outcome_snippet": outcome,
-            "notes": notes,
-        })
-
-    # write ONE file
+    # write ONE file, row by row as each case is resolved
     out_path = os.path.join(OUT_DIR, "cases_enriched.csv")
     ensure_dir(os.path.dirname(out_path))
-    fieldnames = [
-        "case_id","title","citation","jurisdiction","ltj_refs",
-        "ddg_url","bailii_url","jerseylaw_url","final_url",
-        "fetch_status","http_status","decision_date","court","neutral_citation",
-        "outcome_snippet","notes"
-    ]
+    n_out = 0
+    # rows that resolve to the same page share one fetch + parse:
+    # final_url -> (fetch status, http code, metadata, outcome snippet)
+    pages: Dict[str, Tuple[str, int, Dict[str, str], str]] = {}
     with open(out_path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
-        for row in out_rows:
-            w.writerow(row)
+        w = csv.writer(f)
+        w.writerow(FIELDS)
+        for base in rows:
+            case_id = base.case_id or ""
+            title   = base.title
+            citation= base.citation
+            juris   = base.jurisdiction
+            ltjrefs = base.ltj_refs
+            existing_url = base.url
+
+            bailii, jl, ddg, final_url, notes = resolve_urls(title, citation, existing_url)
+
+            fetch_status = "skipped"
+            http_code = ""
+            decision_date = court = neutral = outcome = ""
+
+            if final_url:
+                page = pages.get(final_url)
+                if page is None:
+                    status, code, html_text = fetch_once(final_url)
+                    meta, outcome = {}, ""
+                    if status == "ok" and html_text:
+                        # parse once; both extractors read the same tree
+                        soup = parse_html(html_text)
+                        meta = parse_metadata(soup)
+                        outcome = extract_outcome_snippet(soup)
+                    page = pages[final_url] = (status, code, meta, outcome)
+                status, code, meta, outcome = page
+                fetch_status = status
+                http_code = str(code) if code else ""
+                if status == "ok":
+                    decision_date = meta.get("decision_date","")
+                    court = meta.get("court","")
+                    neutral = meta.get("neutral_citation","")
+                else:
+                    notes = (notes + "; " if notes else "") + "fetch_failed"
+            else:
+                # Keep row; mark not found
+                fetch_status = "skipped"
+                http_code = ""
+                notes = (notes + "; " if notes else "") + "no_final_url"
+
+            w.writerow([
+                case_id, title, citation, juris, ltjrefs,
+                ddg or "", bailii or "", jl or "", final_url or "",
+                fetch_status, http_code, decision_date, court, neutral,
+                outcome, notes,
+            ])
+            n_out += 1
 
     # tiny run report for troubleshooting
     report = {
-        "input_rows": len(rows),
-        "output_rows": len(out_rows),
+        "input_rows": n_out,
+        "output_rows": n_out,
         "timestamp": int(time.time())
     }
     with open(os.path.join(OUT_DIR, "run_report.json"), "w", encoding="utf-8") as f:
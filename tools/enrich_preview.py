@@ -31,6 +31,14 @@ except Exception:
     _DDG_OK = False
 
 
+# regexes used per row (compiled once)
+_PAGE_TAIL_RE = re.compile(r"[,\s]+(\d{1,3}([\-–]\d{1,3})?(,\s*\d{1,3}([\-–]\d{1,3})?)*)\s*$")
+_WS_RE = re.compile(r"\s+")
+_YEAR4_RE = re.compile(r"\d{4}")
+# naive first-link pattern on the DDG html endpoint
+_DDG_FIRST_RE = re.compile(r'<a rel="nofollow" class="result__a" href="([^"]+)"')
+
+
 # --------------------------- Utils ---------------------------
 
 def mk_outdir(path: Path):
@@ -43,8 +51,8 @@ def norm_title(title: str) -> str:
         return ""
     t = title.strip()
     # kill trailing "… , 12-23" or "(Ch) , 12, 24" page/section tails that slip through
-    t = re.sub(r"[,\s]+(\d{1,3}([\-–]\d{1,3})?(,\s*\d{1,3}([\-–]\d{1,3})?)*)\s*$", "", t)
-    t = re.sub(r"\s+", " ", t)
+    t = _PAGE_TAIL_RE.sub("", t)
+    t = _WS_RE.sub(" ", t)
     return t
 
 
@@ -58,7 +66,7 @@ def jersey_law_query(title: str, year: str | None, citation: str | None) -> str
     bits = []
     if citation:
         bits.append(citation)
-    if year and re.fullmatch(r"\d{4}", year or ""):
+    if year and _YEAR4_RE.fullmatch(year or ""):
         bits.append(year)
     if bits:
         q = f'{title} {" ".join(bits)}'
@@ -71,7 +79,7 @@ def bailii_query(title: str, year: str | None, citation: str | None) -> str | No
     bits = []
     if citation:
         bits.append(citation)
-    if year and re.fullmatch(r"\d{4}", year or ""):
+    if year and _YEAR4_RE.fullmatch(year or ""):
         bits.append(year)
     if bits:
         q = f'{title} {" ".join(bits)}'
@@ -79,6 +87,17 @@ def bailii_query(title: str, year: str | None, citation: str | None) -> str | No
     return f"{base}?q={quote_plus(q)}"
 
 
+_DDGS_CLIENTS: dict = {}
+
+
+def ddg_client(tmo: float):
+    """Reuse one DDGS client (and its HTTP session) per timeout for the whole run."""
+    client = _DDGS_CLIENTS.get(tmo)
+    if client is None:
+        client = _DDGS_CLIENTS[tmo] = DDGS(timeout=tmo)
+    return client
+
+
 def ddg_top_result(title: str, year: str | None, citation: str | None, tmo: float = 10.0) -> str | None:
     """
     Use duckduckgo_search if available; otherwise fall back to a simple DDG HTML endpoint
@@ -87,17 +106,16 @@ def ddg_top_result(title: str, year: str | None, citation: str | None, tmo: floa
     query = norm_title(title)
     if citation:
         query = f'{query} "{citation}"'
-    if year and re.fullmatch(r"\d{4}", year or ""):
+    if year and _YEAR4_RE.fullmatch(year or ""):
         query = f"{query} {year}"
 
     # Prefer DDGS library (politer)
     if _DDG_OK:
         try:
-            with DDGS(timeout=tmo) as ddgs:
-                for r in ddgs.text(query, max_results=3, region="uk-en", safesearch="Moderate"):
-                    url = (r or {}).get("href") or (r or {}).get("link") or (r or {}).get("url")
-                    if url:
-                        return url
+            for r in ddg_client(tmo).text(query, max_results=3, region="uk-en", safesearch="Moderate"):
+                url = (r or {}).get("href") or (r or {}).get("link") or (r or {}).get("url")
+                if url:
+                    return url
         except Exception:
             return None
 
@@ -107,8 +125,7 @@ def ddg_top_result(title: str, year: str | None, citation: str | None, tmo: floa
         u = f"https://duckduckgo.com/html/?q={quote_plus(query)}"
         resp = requests.get(u, timeout=tmo, headers={"User-Agent": "Mozilla/5.0"})
         if resp.status_code == 200:
-            # naive first link pattern
-            m = re.search(r'<a rel="nofollow" class="result__a" href="([^"]+)"', resp.text)
+            m = _DDG_FIRST_RE.search(resp.text)
             if m:
                 return m.group(1)
     except Exception:
@@ -5,17 +5,28 @@
 
 import argparse
 import csv
+import hashlib
+import html
 import json
 import os
 import random
+import re
 import sys
 import time
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from bs4 import BeautifulSoup, SoupStrainer
+
+_ORJSON_OK = False
+try:
+    import orjson  # type: ignore  # optional: faster progress lines / reports
+    _ORJSON_OK = True
+except Exception:
+    _ORJSON_OK = False
 
 # ----------------------------
 # CLI
@@ -24,7 +35,7 @@ def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Enrich case CSV with real source URLs (polite, batched).")
     p.add_argument("--input", required=True, help="Path to input CSV (must contain Title column).")
     p.add_argument("--out", required=True, help="Path to output CSV.")
-    p.add_argument("--start", type=int, default=0, help="Start row index (inclusive) in the input dataframe.")
+    p.add_argument("--start", type=int, default=0, help="Start row index (inclusive) in the input CSV.")
     p.add_argument("--end", type=int, default=None, help="End row index (exclusive). Omit for end-of-file.")
     p.add_argument("--sleep-min", type=float, default=2.0, help="Min seconds to sleep between queries.")
     p.add_argument("--sleep-max", type=float, default=4.0, help="Max seconds to sleep between queries.")
@@ -32,7 +43,7 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--timeout", type=float, default=12.0, help="HTTP timeout per request (seconds).")
     p.add_argument("--user-agent", default="Mozilla/5.0 (X11; Linux x86_64) CourtFirstBot/1.0", help="HTTP User-Agent.")
     p.add_argument("--batch-name", default="", help="Optional batch label for logs.")
-    p.add_argument("--ddg-base", default="https://duckduckgo.com/html", help="DuckDuckGo HTML endpoint.")
+    p.add_argument("--ddg-base", default="https://html.duckduckgo.com/html/", help="DuckDuckGo HTML endpoint (the canonical host; duckduckgo.com/html redirects there).")
     p.add_argument("--emit-json", action="store_true", help="Also write urls.json and fetch_report.json next to --out.")
     return p.parse_args()
 
@@ -69,19 +80,54 @@ HEADERS_TEMPLATE = lambda ua: {
 
 SAFE_DOMAINS = ["jerseylaw.je", "bailii.org"]
 
-def is_on_domain(url: str, domain: str) -> bool:
+# only result anchors matter on the DDG page; skip building the rest of the tree
+# (matched on the whole class attribute: a tuple of names misses anchors that
+# carry other classes as well)
+RESULT_LINKS = SoupStrainer("a", class_=re.compile(r"(?:^|\s)(?:result__a|links_main__link)(?:\s|$)"))
+
+RESULT_MARK = b'class="result__a"'
+# any mention of either result class; the first one must sit in an <a> tag
+# carrying exactly RESULT_MARK, or the strainer parse takes over
+RESULT_CLASS_RE = re.compile(rb"result__a|links_main__link")
+TAG_RE = re.compile(r"<[^>]+>")
+
+def first_result_link(page: bytes) -> Tuple[Optional[str], Optional[str]]:
+    """Byte-scan the raw DDG page for the first result anchor; (None, None) if it isn't
+    a plain a.result__a (other classes, other quoting), so the caller parses instead."""
+    m = RESULT_CLASS_RE.search(page)
+    if not m:
+        return None, None
+    i = m.start()
+    start = page.rfind(b"<a ", 0, i)
+    end = page.find(b">", i)
+    if start < 0 or end < 0 or b">" in page[start:i]:
+        return None, None
+    tag = page[start:end]
+    if RESULT_MARK not in tag:
+        return None, None
+    h = tag.find(b'href="')
+    if h < 0:
+        return None, None
+    h += 6
+    href = html.unescape(tag[h:tag.find(b'"', h)].decode("utf-8", "replace"))
+    close = page.find(b"</a>", end)
+    inner = page[end + 1:close].decode("utf-8", "replace") if close > 0 else ""
+    text = " ".join(html.unescape(TAG_RE.sub(" ", inner)).split())
+    return href or None, text
+
+@lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
     try:
-        from urllib.parse import urlparse
-        netloc = urlparse(url).netloc.lower()
-        return netloc.endswith(domain)
-    except Exception:
-        return False
+        return urlparse(url).netloc.lower()
+    except ValueError:
+        return ""  # malformed URL: matches no domain
+
+def is_on_domain(url: str, domain: str) -> bool:
+    return _netloc(url).endswith(domain)
 
-def row_value(row, key: str) -> Optional[str]:
-    if key in row and pd.notna(row[key]):
-        v = str(row[key]).strip()
-        return v if v else None
-    return None
+def row_value(row: Dict[str, str], key: str) -> Optional[str]:
+    v = (row.get(key) or "").strip()
+    return v if v else None
 
 def ddg_query(session: requests.Session, base: str, query: str, timeout: float) -> Tuple[Optional[str], Optional[str]]:
     """Return first result URL + title from DuckDuckGo HTML results page, or (None, None) if none."""
@@ -90,7 +136,11 @@ def ddg_query(session: requests.Session, base: str, query: str, timeout: float)
     if resp.status_code == 429:
         raise requests.HTTPError("429 Too Many Requests")
     resp.raise_for_status()
-    soup = BeautifulSoup(resp.text, "html.parser")
+    # fast path: the first result anchor is found without building any tree
+    url, text = first_result_link(resp.content)
+    if url:
+        return url, text
+    soup = BeautifulSoup(resp.text, "html.parser", parse_only=RESULT_LINKS)
     # DDG HTML page has results links in a.tags with class 'result__a' or in 'links_main__link'
     # We handle both patterns.
     link = soup.select_one("a.result__a") or soup.select_one("a.links_main__link")
@@ -101,20 +151,19 @@ def ddg_query(session: requests.Session, base: str, query: str, timeout: float)
 def polite_sleep(smin: float, smax: float):
     time.sleep(random.uniform(smin, smax))
 
-def build_queries(title: str, year: Optional[str], citation: Optional[str]) -> List[Tuple[str, str]]:
-    """Return an ordered list of (method_label, query) pairs to try."""
-    tokens = [title]
-    if year:
-        tokens.append(str(year))
-    if citation:
-        tokens.append(str(citation))
-    base = " ".join(t for t in tokens if t)
-
-    return [
-        ("ddg:jerseylaw", f'site:jerseylaw.je "{title}" {year or ""}'),
-        ("ddg:bailii",    f'site:bailii.org "{title}" {year or ""}'),
+Q_JERSEYLAW = 'site:jerseylaw.je "{t}" {y}'.format
+Q_BAILII    = 'site:bailii.org "{t}" {y}'.format
+
+@lru_cache(maxsize=1024)
+def build_queries(title: str, year: Optional[str], citation: Optional[str]) -> Tuple[Tuple[str, str], ...]:
+    """Return an ordered tuple of (method_label, query) pairs to try (cached: repeat titles are common)."""
+    base = " ".join(t for t in (title, year, citation) if t)
+    y = year or ""
+    return (
+        ("ddg:jerseylaw", Q_JERSEYLAW(t=title, y=y)),
+        ("ddg:bailii",    Q_BAILII(t=title, y=y)),
         ("ddg:open",      base),
-    ]
+    )
 
 def pick_url_for_row(session: requests.Session,
                      ddg_base: str,
@@ -167,6 +216,56 @@ def pick_url_for_row(session: requests.Session,
 
     return None, None, "none", "no acceptable domain match"
 
+CHECKPOINT_EVERY = 200  # rows between progress-log flushes
+
+def load_progress(path: str) -> Dict[int, dict]:
+    """Read an append-only progress log back into {row_index: record}."""
+    done: Dict[int, dict] = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from an interrupted run
+            done[rec["row_index"]] = rec
+    return done
+
+def open_progress(path: str):
+    """Open the progress log for appending. A torn last line from an interrupted
+    run is cut back to the last newline first, so the next record is not glued
+    onto it (and lost with it)."""
+    if os.path.exists(path):
+        with open(path, "rb+") as fh:
+            if fh.seek(0, 2):
+                fh.seek(-1, 2)
+                if fh.read(1) != b"\n":
+                    fh.seek(0)
+                    fh.truncate(fh.read().rfind(b"\n") + 1)
+    return open(path, "a", encoding="utf-8")
+
+def json_line(obj) -> str:
+    if _ORJSON_OK:
+        return orjson.dumps(obj).decode("utf-8") + "\n"
+    return json.dumps(obj, ensure_ascii=False) + "\n"
+
+def write_json(path: str, obj):
+    if _ORJSON_OK:
+        with open(path, "wb") as fh:
+            fh.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(obj, fh, ensure_ascii=False, indent=2)
+
+def flush_progress(fh, pending: List[str]):
+    if not pending:
+        return
+    fh.writelines(pending)
+    fh.flush()
+    os.fsync(fh.fileno())
+    pending.clear()
+
 def write_step_summary(lines: List[str]):
     path = os.getenv("GITHUB_STEP_SUMMARY")
     if not path:
@@ -183,33 +282,91 @@ def write_step_summary(lines: List[str]):
 def main():
     args = parse_args()
 
-    # Read input CSV
-    df = pd.read_csv(args.input)
-    if "Title" not in df.columns:
+    # Read input CSV (plain rows; cells are updated in place and written back at the end)
+    with open(args.input, newline="", encoding="utf-8") as fh:
+        reader = csv.DictReader(fh)
+        fieldnames = list(reader.fieldnames or [])
+        rows = list(reader)
+    if "Title" not in fieldnames:
         sys.stderr.write("ERROR: input CSV must have a 'Title' column\n")
         sys.exit(2)
 
+    # Ensure output columns exist
+    for col in ["url", "url_source", "url_status"]:
+        if col not in fieldnames:
+            fieldnames.append(col)
+
+    def write_rows():
+        # temp file + rename: --out may be the input CSV itself
+        tmp = args.out + ".tmp"
+        with open(tmp, "w", newline="", encoding="utf-8") as fh:
+            w = csv.DictWriter(fh, fieldnames=fieldnames, restval="")
+            w.writeheader()
+            w.writerows(rows)
+        os.replace(tmp, args.out)
+
     start = max(0, int(args.start or 0))
-    end = int(args.end) if args.end is not None else len(df)
-    end = min(end, len(df))
+    end = int(args.end) if args.end is not None else len(rows)
+    end = min(end, len(rows))
     if start >= end:
         sys.stderr.write(f"Nothing to do: start={start} >= end={end}\n")
         # still write out unchanged CSV for determinism
-        df.to_csv(args.out, index=False)
+        write_rows()
         return
 
-    # Ensure output columns exist
-    for col in ["url", "url_source", "url_status"]:
-        if col not in df.columns:
-            df[col] = ""
-
     session = requests.Session()
     session.headers.update(HEADERS_TEMPLATE(args.user_agent))
 
-    picks: List[URLPick] = []
     ctr = Counters(total=(end - start))
     t0 = time.time()
 
+    def record(i: int, pick: URLPick, status: str):
+        row = rows[i]
+        row["url"] = pick.chosen_url or ""
+        row["url_source"] = pick.chosen_domain or ""
+        row["url_status"] = status
+
+    # Resume: rows already in this slice's progress log are applied, not re-queried.
+    # Only definitive outcomes (found / not found / skip) are logged; rows that
+    # hit an error (429s, timeouts) are left out so a rerun retries them.
+    # The log is append-only, so checkpointing stays O(rows) over the whole run.
+    out_dir = os.path.dirname(os.path.abspath(args.out)) or "."
+    os.makedirs(out_dir, exist_ok=True)
+    # named by the input file as well as the slice, so the same slice of another
+    # --input never replays this log
+    in_tag = hashlib.sha1(os.path.abspath(args.input).encode("utf-8")).hexdigest()[:10]
+    ck_path = os.path.join(out_dir, f"enrich_progress_{in_tag}_{start}_{end}.jsonl")
+    done = set()
+    for rec in load_progress(ck_path).values():
+        status = rec.pop("url_status", "")
+        pick = URLPick(**rec)
+        if pick.method == "error":
+            continue  # logged by an older run: retry it
+        record(pick.row_index, pick, status)
+        done.add(pick.row_index)
+        ctr.attempted += 1
+        if pick.chosen_url:
+            ctr.found += 1
+        elif pick.method != "skip":
+            ctr.not_found += 1
+    if done:
+        print(f"enrich: resuming, {len(done)} rows already in {ck_path}", flush=True)
+
+    ck_fh = open_progress(ck_path)
+    pending: List[str] = []
+    # error picks stay in memory (not in the log) for the urls.json sidecar
+    errored: List[URLPick] = []
+
+    def checkpoint(i: int, pick: URLPick, status: str):
+        record(i, pick, status)
+        pending.append(json_line({**asdict(pick), "url_status": status}))
+        if len(pending) >= CHECKPOINT_EVERY:
+            flush_progress(ck_fh, pending)
+
+    def failed(i: int, pick: URLPick, status: str):
+        record(i, pick, status)
+        errored.append(pick)
+
     # Heartbeat header
     write_step_summary([
         f"### Enrich batch {args.batch_name or ''}".strip(),
@@ -218,82 +375,78 @@ def main():
         ""
     ])
 
-    for i in range(start, end):
-        row = df.iloc[i]
-        title = row_value(row, "Title")
-        year = row_value(row, "Year")
-        citation = row_value(row, "Citation")
-        juris = row_value(row, "Jurisdiction")
+    try:
+        for i in range(start, end):
+            if i in done:
+                continue
+            row = rows[i]
+            title = row_value(row, "Title")
+            year = row_value(row, "Year")
+            citation = row_value(row, "Citation")
+            juris = row_value(row, "Jurisdiction")
 
-        ctr.attempted += 1
+            ctr.attempted += 1
 
-        if not title:
-            picks.append(URLPick(i, "", year, citation, juris, None, None, "skip", "missing title"))
-            df.at[i, "url"] = ""
-            df.at[i, "url_source"] = ""
-            df.at[i, "url_status"] = "skip: no title"
-            continue
-
-        try:
-            url, domain, method, reason = pick_url_for_row(
-                session=session,
-                ddg_base=args.ddg_base,
-                title=title,
-                year=year,
-                citation=citation,
-                timeout=args.timeout,
-                smin=args.sleep_min,
-                smax=args.sleep_max,
-                max_retries=args.max_retries,
-            )
-            if url:
-                ctr.found += 1
-                df.at[i, "url"] = url
-                df.at[i, "url_source"] = domain or ""
-                df.at[i, "url_status"] = method
-                picks.append(URLPick(i, title, year, citation, juris, url, domain, method, reason))
-            else:
-                ctr.not_found += 1
-                df.at[i, "url"] = ""
-                df.at[i, "url_source"] = ""
-                df.at[i, "url_status"] = reason
-                picks.append(URLPick(i, title, year, citation, juris, None, None, method, reason))
-        except requests.HTTPError as e:
-            msg = str(e)
-            if "429" in msg:
-                ctr.ddg_rate_limited += 1
-            ctr.errors += 1
-            df.at[i, "url"] = ""
-            df.at[i, "url_source"] = ""
-            df.at[i, "url_status"] = f"http error: {msg}"
-            picks.append(URLPick(i, title, year, citation, juris, None, None, "error", msg))
-        except Exception as e:
-            ctr.errors += 1
-            df.at[i, "url"] = ""
-            df.at[i, "url_source"] = ""
-            df.at[i, "url_status"] = f"error: {e}"
-            picks.append(URLPick(i, title, year, citation, juris, None, None, "error", str(e)))
-
-        # polite pacing between rows
-        polite_sleep(args.sleep_min, args.sleep_max)
-
-        # heartbeat line to logs each ~50 rows
-        if (i - start + 1) % 50 == 0 or (i + 1) == end:
-            done = (i - start + 1)
-            rate = done / max(1.0, (time.time() - t0))
-            print(f"enrich: {done}/{ctr.total} (~{rate:.2f}/s)", flush=True)
+            if not title:
+                checkpoint(i, URLPick(i, "", year, citation, juris, None, None, "skip", "missing title"), "skip: no title")
+                continue
+
+            try:
+                url, domain, method, reason = pick_url_for_row(
+                    session=session,
+                    ddg_base=args.ddg_base,
+                    title=title,
+                    year=year,
+                    citation=citation,
+                    timeout=args.timeout,
+                    smin=args.sleep_min,
+                    smax=args.sleep_max,
+                    max_retries=args.max_retries,
+                )
+                if url:
+                    ctr.found += 1
+                    checkpoint(i, URLPick(i, title, year, citation, juris, url, domain, method, reason), method)
+                else:
+                    ctr.not_found += 1
+                    checkpoint(i, URLPick(i, title, year, citation, juris, None, None, method, reason), reason)
+            except requests.HTTPError as e:
+                msg = str(e)
+                if "429" in msg:
+                    ctr.ddg_rate_limited += 1
+                ctr.errors += 1
+                failed(i, URLPick(i, title, year, citation, juris, None, None, "error", msg), f"http error: {msg}")
+            except Exception as e:
+                ctr.errors += 1
+                failed(i, URLPick(i, title, year, citation, juris, None, None, "error", str(e)), f"error: {e}")
+
+            # polite pacing between rows
+            polite_sleep(args.sleep_min, args.sleep_max)
+
+            # heartbeat line to logs each ~50 rows
+            if (i - start + 1) % 50 == 0 or (i + 1) == end:
+                n_done = (i - start + 1)
+                rate = n_done / max(1.0, (time.time() - t0))
+                print(f"enrich: {n_done}/{ctr.total} (~{rate:.2f}/s)", flush=True)
+    finally:
+        # keep whatever was processed, even on Ctrl-C / crash
+        flush_progress(ck_fh, pending)
+        ck_fh.close()
 
     # Write outputs
-    os.makedirs(os.path.dirname(os.path.abspath(args.out)) or ".", exist_ok=True)
-    df.to_csv(args.out, index=False)
+    write_rows()
 
-    # Optional JSON sidecar reports
+    # Optional JSON sidecar reports (picks are read back from the progress log
+    # rather than held in memory for the whole run)
     if args.emit_json:
-        out_dir = os.path.dirname(os.path.abspath(args.out)) or "."
-        with open(os.path.join(out_dir, "urls.json"), "w", encoding="utf-8") as fh:
-            json.dump([asdict(p) for p in picks], fh, ensure_ascii=False, indent=2)
-        with open(os.path.join(out_dir, "fetch_report.json"), "w", encoding="utf-8") as fh:
-            json.dump(asdict(ctr), fh, ensure_ascii=False, indent=2)
+        recs = load_progress(ck_path)
+        for rec in recs.values():
+            rec.pop("url_status", None)
+        recs.update((p.row_index, asdict(p)) for p in errored)
+        write_json(os.path.join(out_dir, "urls.json"), [recs[k] for k in sorted(recs)])
+        write_json(os.path.join(out_dir, "fetch_report.json"), asdict(ctr))
+
+    # slice complete and written; a fresh run of the same slice starts over
+    os.remove(ck_path)
 
     # Final summary
     elapsed = time.time() - t0
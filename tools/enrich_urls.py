@@ -16,12 +16,15 @@ Inputs:
   --out   data/cases.csv     (safe, in-place update)
   --start 0 --end 500        (0-based, end exclusive; handy for small trials)
   --sleep-min 1.5 --sleep-max 3.5
+  --workers 1                (rows resolved in parallel; >1 also spaces requests to each host across workers)
   --batch-name "1..500"      (just for console/report labels)
   --emit-json                (write small previews under out/preview-enrichment/)
 """
 
 import argparse
 import csv
+import hashlib
+import heapq
 import html
 import io
 import json
@@ -30,12 +33,18 @@ import os
 import random
 import re
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, UnicodeDammit
 
 # --- Tunables ---------------------------------------------------------
 
@@ -45,8 +54,14 @@ HEADERS = {
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 
-DDG_HTML = "https://duckduckgo.com/html/"
+DDG_MAX_RESULTS = 10       # results read per query (before the allowed-site filter)
 TIMEOUT = 30
+DDG_CACHE_DIR = "out/cache/ddg"      # one JSON file per query (sha1 of the query text)
+DDG_CACHE_TTL = 14 * 24 * 3600       # seconds; older entries are re-queried
+VERDICT_CACHE = "out/cache/verified_urls.json"  # "title||citation||sites" -> verified URL from earlier runs
+VERDICT_CACHE_TTL = 30 * 24 * 3600   # seconds; older verdicts are re-resolved
+CHECKPOINT_EVERY = 50                # rows between atomic rewrites of --out
+MAX_PAGE_BYTES = 2 * 1024 * 1024     # larger bodies are judgment PDFs/galleries, not case pages
 TITLE_SIM_THRESHOLD = 0.72  # conservative; we can tighten/loosen later
 MAX_PER_SITE_RESULTS = 5    # scan first N results per domain attempt
 
@@ -56,6 +71,34 @@ ALLOWED_SITES = [
 ]
 # We’ll never *prefer* casemine; if a user later wants it, add here and a site-specific validator.
 
+ALLOWED = frozenset(ALLOWED_SITES)
+# shared " site:<domain>" query suffixes, built once
+SITE_SUFFIX = {d: " site:" + d for d in ALLOWED_SITES}
+
+class LoggedRetry(Retry):
+    """urllib3 Retry that prints one line per retry, so backoff shows in the log."""
+    def increment(self, method=None, url=None, *args, **kwargs):
+        new = super().increment(method, url, *args, **kwargs)
+        last = new.history[-1] if new.history else None
+        why = (last.status or type(last.error).__name__) if last else "?"
+        print(f"[{time.strftime('%H:%M:%S')}] retry {len(new.history)} for {url} ({why})")
+        return new
+
+# One pooled session for the run's candidate-page fetches (DDG goes through
+# duckduckgo_search): JerseyLaw and BAILII connections stay alive between pages.
+# A bad candidate is one of several per row, so retries are few and short
+# (honouring Retry-After); a page that keeps failing, or any 500, is skipped.
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=LoggedRetry(total=2, backoff_factor=0.5,
+                            status_forcelist=[429, 502, 503, 504],
+                            respect_retry_after_header=True),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
 # simple “Jersey” detector by citation/jurisdiction strings
 JERSEY_MARKERS = [
     "JLR", "JRC", "JCA", "Jersey"
@@ -65,6 +108,18 @@ UK_MARKERS = [
     "EWCA", "EWHC", "UKHL", "UKSC", "WLR", "All ER", "AC", "QB", "Ch", "Fam"
 ]
 
+# parse only what each step reads instead of the whole page
+HEAD_TAGS = SoupStrainer(["title", "h1", "h2", "strong", "b"])
+_QUOTE_RE = re.compile(r"[\u2018\u2019\u201C\u201D]")
+_PUNCT_RE = re.compile(r"[.,;:“”\"'()\[\]{}]")
+_WS_RE = re.compile(r"\s+")
+# markup that contributes no visible text, then any remaining tag
+_HIDDEN_RE = re.compile(r"<!--.*?-->|<(script|style)\b.*?</\1\s*>", re.I | re.S)
+_TAG_RE = re.compile(r"<[^>]*>")
+_CITE_YEAR_RE = re.compile(r"\[(\d{4})\]")
+_ALNUM_RE = re.compile(r"[^\W_]+")
+_CITE_NEUTRAL_RE = re.compile(r"\b(EWHC|EWCA|UKSC|UKHL|JRC|JCA|JLR)\b[^\s,;]{0,10}")
+
 # ---------------------------------------------------------------------
 
 def norm(s: str) -> str:
@@ -72,58 +127,150 @@ def norm(s: str) -> str:
     s = html.unescape(s or "")
     s = s.replace(" vs ", " v ")
     s = s.replace(" v. ", " v ")
-    s = re.sub(r"[\u2018\u2019\u201C\u201D]", "", s)  # quotes
-    s = re.sub(r"[.,;:“”\"'()\[\]{}]", " ", s)
-    s = re.sub(r"\s+", " ", s.lower()).strip()
+    s = _QUOTE_RE.sub("", s)  # quotes
+    s = _PUNCT_RE.sub(" ", s)
+    s = _WS_RE.sub(" ", s.lower()).strip()
     return s
 
-def title_similarity(a: str, b: str) -> float:
-    """Very small token-based similarity, no external deps."""
-    ta = set(norm(a).split())
-    tb = set(norm(b).split())
+def token_set(s: str) -> frozenset:
+    return frozenset(norm(s).split())
+
+def jaccard(ta: frozenset, tb: frozenset) -> float:
     if not ta or not tb:
         return 0.0
     inter = len(ta & tb)
-    denom = len(ta | tb)
-    return inter / denom if denom else 0.0
+    # |A ∪ B| = |A| + |B| - |A ∩ B|; no union set is built
+    return inter / (len(ta) + len(tb) - inter)
 
-def looks_jersey(row: Dict[str, str]) -> bool:
-    fields = " ".join([row.get("Citation",""), row.get("Jurisdiction",""), row.get("citation",""), row.get("jurisdiction","")])
+def similar_enough(ta: frozenset, tb: frozenset, threshold: float) -> bool:
+    """jaccard(ta, tb) >= threshold, skipping the intersection when sizes alone rule it out."""
+    na, nb = len(ta), len(tb)
+    if not na or not nb:
+        return False
+    # |A ∩ B| <= min(|A|, |B|) and |A ∪ B| >= max(|A|, |B|), so min/max bounds the score
+    if min(na, nb) < threshold * max(na, nb):
+        return False
+    inter = len(ta & tb)
+    return inter >= threshold * (na + nb - inter)
+
+def title_similarity(a: str, b: str) -> float:
+    """Very small token-based similarity, no external deps."""
+    return jaccard(token_set(a), token_set(b))
+
+def looks_jersey(fields: str) -> bool:
+    """fields = citation + jurisdiction text of the row."""
     return any(m in fields for m in JERSEY_MARKERS)
 
-def looks_uk(row: Dict[str, str]) -> bool:
-    fields = " ".join([row.get("Citation",""), row.get("Jurisdiction",""), row.get("citation",""), row.get("jurisdiction","")])
+def looks_uk(fields: str) -> bool:
     return any(m in fields for m in UK_MARKERS)
 
-def ddg_query(q: str) -> List[str]:
-    """Query DDG HTML endpoint; return list of result URLs (as absolute)."""
-    params = {"q": q}
-    r = requests.get(DDG_HTML, params=params, headers=HEADERS, timeout=TIMEOUT)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    out = []
-    for a in soup.select("a.result__a"):
-        href = a.get("href", "")
-        if not href:
-            continue
-        # DDG returns direct links in HTML version
-        out.append(href)
-    return out
+_local = threading.local()
+
+# Per-host pacing shared by all workers. Set from --sleep-min/--sleep-max when
+# --workers > 1; None (one worker) leaves pacing to the sleep between rows.
+HOST_GAP: Optional[Tuple[float, float]] = None
+_host_lock = threading.Lock()
+_host_next: Dict[str, float] = {}
 
-def fetch(url: str) -> Optional[str]:
+def host_wait(host: str):
+    """Block until `host` may be hit again: its requests start HOST_GAP apart, whichever worker sends them."""
+    if HOST_GAP is None:
+        return
+    with _host_lock:
+        now = time.monotonic()
+        start = max(now, _host_next.get(host, 0.0))
+        _host_next[host] = start + random.uniform(*HOST_GAP)
+    if start > now:
+        time.sleep(start - now)
+
+# duckduckgo_search.DDGS, imported by main() before the workers start and only
+# when some row isn't answered by the verdict cache
+_DDGS = None
+
+def ddg_client():
+    # one DDGS client per worker thread, reused for every query it runs
+    if not hasattr(_local, "ddgs"):
+        _local.ddgs = _DDGS()
+    return _local.ddgs
+
+def ddg_query(q: str) -> List[str]:
+    """Query DDG via duckduckgo_search (structured results, no SERP parsing); return result URLs."""
+    _local.net_calls = getattr(_local, "net_calls", 0) + 1
+    host_wait("duckduckgo.com")
+    results = ddg_client().text(q, region="uk-en", max_results=DDG_MAX_RESULTS) or []
+    return [r["href"] for r in results if r.get("href")]
+
+@lru_cache(maxsize=2048)
+def cached_ddg(q: str) -> Tuple[str, ...]:
+    """ddg_query with an on-disk cache, so repeated queries (within a run or on a rerun) skip DDG."""
+    path = os.path.join(DDG_CACHE_DIR, hashlib.sha1(q.encode("utf-8")).hexdigest() + ".json")
     try:
-        r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-        if r.status_code != 200:
-            return None
-        # Very basic content discard for PDFs etc (we’ll skip them for now)
-        ctype = r.headers.get("Content-Type","").lower()
-        if "text/html" not in ctype:
-            return None
-        # Avoid binary surprise
-        text = r.text
-        if not text:
+        with open(path, encoding="utf-8") as f:
+            hit = json.load(f)
+        if time.time() - hit["ts"] < DDG_CACHE_TTL:
+            return tuple(hit["urls"])
+    except (OSError, ValueError, KeyError):
+        pass
+    urls = ddg_query(q)
+    # empty results aren't stored: a throttled DDG can answer with none
+    if urls:
+        os.makedirs(DDG_CACHE_DIR, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"ts": time.time(), "q": q, "urls": urls}, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    return tuple(urls)
+
+def verdict_key(key: Tuple[str, str, Tuple[str, ...]]) -> str:
+    """Cache key for a row group: its normalised title, citation and site order, as text.
+
+    Used verbatim (no digest) - the parts are short, and this is built for every
+    group at startup.
+    """
+    return "||".join((key[0], key[1], ",".join(key[2])))
+
+def load_verdicts(path: str) -> Dict[str, dict]:
+    """Verified URLs from earlier runs still inside VERDICT_CACHE_TTL."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    now = time.time()
+    return {k: v for k, v in cache.items() if now - v.get("ts", 0) < VERDICT_CACHE_TTL}
+
+def save_verdicts(path: str, cache: Dict[str, dict]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+def fetch(url: str) -> Optional[bytes]:
+    """Raw page bytes (decoded only if the page survives the cheap checks in verify_candidate)."""
+    _local.net_calls = getattr(_local, "net_calls", 0) + 1
+    host_wait(urlsplit(url).hostname or "")
+    try:
+        # Stream so PDFs and oversized pages are dropped on their headers, before the body
+        with SESSION.get(url, timeout=TIMEOUT, stream=True) as r:
+            if r.status_code != 200:
+                return None
+            # Very basic content discard for PDFs etc (we’ll skip them for now)
+            ctype = r.headers.get("Content-Type","").lower()
+            if "text/html" not in ctype:
+                return None
+            size = r.headers.get("Content-Length", "")
+            if size.isdigit() and int(size) > MAX_PAGE_BYTES:
+                return None
+            # Servers may omit or understate Content-Length; cap the read as well
+            body = bytearray()
+            for chunk in r.iter_content(chunk_size=64 * 1024):
+                body += chunk
+                if len(body) > MAX_PAGE_BYTES:
+                    return None
+        if not body:
             return None
-        return text
+        return bytes(body)
     except Exception:
         return None
 
@@ -132,31 +279,50 @@ def citation_token(cite: str) -> Optional[str]:
     if not cite:
         return None
     # Prefer bracketed year
-    m = re.search(r"\[(\d{4})\]", cite)
+    m = _CITE_YEAR_RE.search(cite)
     if m:
         return m.group(0)  # keep the brackets
     # Else pull a neutral chunk like EWHC 1234 or JRC 045
-    m = re.search(r"\b(EWHC|EWCA|UKSC|UKHL|JRC|JCA|JLR)\b[^\s,;]{0,10}", cite)
+    m = _CITE_NEUTRAL_RE.search(cite)
     if m:
         return m.group(0)
     return None
 
-def choose_domains(row: Dict[str, str]) -> List[str]:
+def choose_domains(fields: str) -> List[str]:
     # Policy: Jersey first if looks jersey; else UK -> BAILII first; else try both.
-    if looks_jersey(row):
+    if looks_jersey(fields):
         return ["www.jerseylaw.je", "www.bailii.org"]
-    if looks_uk(row):
+    if looks_uk(fields):
         return ["www.bailii.org", "www.jerseylaw.je"]
     return ["www.jerseylaw.je", "www.bailii.org"]
 
+def on_allowed_site(u: str) -> bool:
+    parts = urlsplit(u)
+    return parts.netloc in ALLOWED and parts.scheme in ("http", "https")
+
 @dataclass
 class Verdict:
     url: Optional[str]
     reason: str
 
-def verify_candidate(title: str, cite: str, html_text: str) -> bool:
-    # Extract page title-ish text
-    soup = BeautifulSoup(html_text, "html.parser")
+def page_text(html_text: str) -> str:
+    """Visible text of a page, whitespace collapsed; no tree is built."""
+    s = _TAG_RE.sub(" ", _HIDDEN_RE.sub(" ", html_text))
+    return _WS_RE.sub(" ", html.unescape(s)).strip()
+
+def verify_candidate(title_tokens: frozenset, cite_tok: Optional[str], html_bytes: bytes) -> bool:
+    """title_tokens / cite_tok are fixed per row: see resolve_url_for_row."""
+    # The letters and digits of the citation token have to be in the raw page
+    # for the text check below to pass, so pages without them are rejected
+    # before any decode or parse. (Runs of them, not the whole token: markup may
+    # sit between words, and brackets may be entity-encoded as &#91;...&#93;.)
+    if cite_tok and not all(part.encode("utf-8") in html_bytes for part in _ALNUM_RE.findall(cite_tok)):
+        return False
+    html_text = UnicodeDammit(html_bytes, is_html=True).unicode_markup or ""
+    # Extract page title-ish text. Most candidates fail the title check, so only
+    # the heading tags are built here; the citation check further down scans
+    # the page text without building a tree.
+    soup = BeautifulSoup(html_text, "html.parser", parse_only=HEAD_TAGS)
     page_head = soup.find("title")
     h1 = soup.find("h1")
     candidates = []
@@ -170,76 +336,86 @@ def verify_candidate(title: str, cite: str, html_text: str) -> bool:
         if el and el.text:
             candidates.append(el.text)
             break
-    # Compare
-    best = 0.0
-    for c in candidates:
-        best = max(best, title_similarity(title, c))
-    if best < TITLE_SIM_THRESHOLD:
+    # Compare: stop at the first candidate that clears the threshold
+    if not any(similar_enough(title_tokens, token_set(c), TITLE_SIM_THRESHOLD) for c in candidates):
         return False
-    tok = citation_token(cite)
-    if tok:
-        if tok not in soup.get_text(" ", strip=True):
+    if cite_tok:
+        if cite_tok not in page_text(html_text):
             return False
     return True
 
-def resolve_url_for_row(row: Dict[str,str]) -> Verdict:
-    title = (row.get("Title") or row.get("title") or "").strip()
-    cite  = (row.get("Citation") or row.get("citation") or "").strip()
+def resolve_url_for_row(title: str, cite: str, fields: str) -> Verdict:
+    """title/cite are the row's stripped cells; fields is its citation + jurisdiction text."""
     if not title:
         return Verdict(None, "no-title")
 
-    domains = choose_domains(row)
+    domains = choose_domains(fields)
+    # the row side of verification never changes across candidates
+    title_tokens = token_set(title)
+    cite_tok = citation_token(cite)
 
     # Try domain-scoped exact title searches first, then fall back to generic.
+    quoted = '"' + title + '"'
     queries = []
     for d in domains:
-        queries.append(f'"{title}" site:{d}')
+        queries.append(quoted + SITE_SUFFIX[d])
         if cite:
-            queries.append(f'"{title}" {cite} site:{d}')
+            queries.append(quoted + " " + cite + SITE_SUFFIX[d])
 
     # last resort (domain-free)
-    queries.append(f'"{title}" {cite}'.strip())
+    queries.append(quoted + " " + cite if cite else quoted)
     if cite:
-        queries.append(f'"{title}" {cite.split()[0]}')
+        queries.append(quoted + " " + cite.split()[0])
 
     seen = set()
-    for q in queries:
+    # identical queries (e.g. from a one-word citation) are sent once
+    for q in dict.fromkeys(queries):
         try:
-            hits = ddg_query(q)
+            hits = cached_ddg(q)
         except Exception as e:
             return Verdict(None, f"ddg-error:{type(e).__name__}")
 
         # keep only allowed sites
-        hits = [u for u in hits if any(u.startswith(f"https://{dom}") or u.startswith(f"http://{dom}") for dom in ALLOWED_SITES)]
+        hits = [u for u in hits if on_allowed_site(u)]
         for u in hits[:MAX_PER_SITE_RESULTS]:
             if u in seen:
                 continue
             seen.add(u)
-            html_text = fetch(u)
-            if not html_text:
+            html_bytes = fetch(u)
+            if not html_bytes:
                 continue
-            if verify_candidate(title, cite, html_text):
+            if verify_candidate(title_tokens, cite_tok, html_bytes):
                 return Verdict(u, "ok")
     return Verdict(None, "no-verified-match")
 
-def read_csv(path: str) -> List[Dict[str,str]]:
+def read_csv(path: str) -> Tuple[List[str], List[List[str]]]:
+    """Return (header, rows); rows are plain lists padded to the header width."""
     with open(path, newline="", encoding="utf-8") as f:
-        return list(csv.DictReader(f))
-
-def write_csv(path: str, rows: List[Dict[str,str]]):
-    # Preserve field order if present, else add url at end
-    fields = list(rows[0].keys()) if rows else []
-    if "url" not in fields:
-        fields.append("url")
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fields)
-        w.writeheader()
-        for r in rows:
-            if "url" not in r:
-                r["url"] = ""
-            w.writerow(r)
+        rdr = csv.reader(f)
+        header = next(rdr, [])
+        width = len(header)
+        return header, [r + [""] * (width - len(r)) for r in rdr if r]
+
+def write_csv(path: str, header: List[str], rows: List[List[str]]):
+    # temp file + rename: --out may be the input itself, and a checkpoint
+    # interrupted mid-write must not leave a truncated CSV behind
+    tmp = f"{path}.ckpt.tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+    os.replace(tmp, path)
+
+def cell(r: List[str], idx: Dict[str, int], *names: str) -> str:
+    """First non-empty value among the named columns (e.g. 'Title', then 'title')."""
+    for name in names:
+        i = idx.get(name)
+        if i is not None and r[i]:
+            return r[i]
+    return ""
 
 def main():
+    global HOST_GAP, _DDGS
     ap = argparse.ArgumentParser()
     ap.add_argument("--input", required=True)
     ap.add_argument("--out", required=True)
@@ -247,11 +423,13 @@ def main():
     ap.add_argument("--end", type=int, default=-1, help="end (exclusive); -1 = to end")
     ap.add_argument("--sleep-min", type=float, default=1.5)
     ap.add_argument("--sleep-max", type=float, default=3.5)
+    ap.add_argument("--workers", type=int, default=1,
+                    help="rows resolved in parallel (opt-in; requests to one host stay paced across workers)")
     ap.add_argument("--batch-name", default="")
     ap.add_argument("--emit-json", action="store_true")
     args = ap.parse_args()
 
-    rows = read_csv(args.input)
+    header, rows = read_csv(args.input)
     n = len(rows)
     s = max(0, args.start)
     e = n if args.end < 0 else min(n, args.end)
@@ -263,53 +441,111 @@ def main():
     ok, skipped = {}, {}
     processed = 0
 
-    # Ensure url column exists in memory
-    for r in rows:
-        if "url" not in r:
-            r["url"] = ""
-
+    # Ensure url column exists (appended at the end, as before)
+    if "url" not in header:
+        header.append("url")
+        for r in rows:
+            r.append("")
+    idx = {name: i for i, name in enumerate(header)}
+    url_i = idx["url"]
+
+    # rows for the same case (same normalised title + citation, same site order)
+    # are resolved once and the verdict applied to every copy
+    groups: Dict[Tuple[str, str, Tuple[str, ...]], List[int]] = {}
+    todo: Dict[int, Tuple[str, str, str]] = {}  # first row of each group -> resolver args
     for i in range(s, e):
         r = rows[i]
-        title = (r.get("Title") or r.get("title") or "").strip()
+        title = cell(r, idx, "Title", "title").strip()
         if not title:
             skipped[i] = {"title": title, "reason": "no-title"}
             continue
 
         # If already has a URL, keep it
-        if r.get("url"):
+        if r[url_i]:
             processed += 1
             if processed % 10 == 0:
                 print(f"[{time.strftime('%H:%M:%S')}] progress: {processed}/{e-s} (kept existing)")
             continue
 
-        v = resolve_url_for_row(r)
-        if v.url:
-            rows[i]["url"] = v.url
-            ok[i] = {"title": title, "url": v.url}
-        else:
-            skipped[i] = {"title": title, "reason": v.reason}
+        cite = cell(r, idx, "Citation", "citation").strip()
+        fields = " ".join(r[idx[c]] for c in ("Citation", "Jurisdiction", "citation", "jurisdiction") if c in idx)
+        key = (norm(title), norm(cite), tuple(choose_domains(fields)))
+        if key not in groups:
+            todo[i] = (title, cite, fields)
+        groups.setdefault(key, []).append(i)
 
-        processed += 1
-        if processed % 10 == 0:
-            print(f"[{time.strftime('%H:%M:%S')}] progress: {processed}/{e-s}")
+    # rows verified on an earlier run skip both the DDG queries and the page fetches
+    verdicts = load_verdicts(VERDICT_CACHE)
+    group_key = {idxs[0]: verdict_key(key) for key, idxs in groups.items()}
 
-        # politeness sleep
-        pause = random.uniform(args.sleep_min, args.sleep_max)
-        time.sleep(pause)
-
-    write_csv(args.out, rows)
+    # a missing duckduckgo_search stops the run here, rather than turning into a
+    # ddg-error skip on every row
+    if any(k not in verdicts for k in group_key.values()):
+        try:
+            from duckduckgo_search import DDGS as _DDGS
+        except ImportError as exc:
+            print(f"ERROR: duckduckgo_search is required to resolve rows ({exc}); "
+                  "pip install duckduckgo-search", file=sys.stderr)
+            sys.exit(2)
+
+    def resolve_paced(i: int) -> Verdict:
+        hit = verdicts.get(group_key[i])
+        if hit:
+            return Verdict(hit["url"], "ok")
+        sent = getattr(_local, "net_calls", 0)
+        v = resolve_url_for_row(*todo[i])
+        # politeness sleep (per worker, so each worker still paces its own rows);
+        # only rows that sent no DDG query and fetched no page skip it
+        if getattr(_local, "net_calls", 0) != sent:
+            pause = random.uniform(args.sleep_min, args.sleep_max)
+            time.sleep(pause)
+        return v
+
+    # network-bound: groups are resolved concurrently, results consumed in order
+    # --out is rewritten every CHECKPOINT_EVERY rows and once more on the way
+    # out (including Ctrl-C), so an interrupted run keeps the URLs it found
+    members = list(groups.values())
+    if args.workers > 1:
+        HOST_GAP = (args.sleep_min, args.sleep_max)
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers))
+    last_ck = processed
+    try:
+        for idxs, v in zip(members, pool.map(resolve_paced, [g[0] for g in members])):
+            if v.url and group_key[idxs[0]] not in verdicts:
+                verdicts[group_key[idxs[0]]] = {"url": v.url, "ts": time.time()}
+            for i in idxs:
+                title = cell(rows[i], idx, "Title", "title").strip()
+                if v.url:
+                    rows[i][url_i] = v.url
+                    ok[i] = {"title": title, "url": v.url}
+                else:
+                    skipped[i] = {"title": title, "reason": v.reason}
+
+                # heartbeat counts rows, not groups
+                processed += 1
+                if processed % 10 == 0:
+                    print(f"[{time.strftime('%H:%M:%S')}] progress: {processed}/{e-s}")
+
+            if processed - last_ck >= CHECKPOINT_EVERY:
+                write_csv(args.out, header, rows)
+                save_verdicts(VERDICT_CACHE, verdicts)
+                last_ck = processed
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+        write_csv(args.out, header, rows)
+        save_verdicts(VERDICT_CACHE, verdicts)
 
     if args.emit_json:
         os.makedirs("out/preview-enrichment", exist_ok=True)
         with open("out/preview-enrichment/urls_preview.json", "w", encoding="utf-8") as f:
-            json.dump(ok, f, indent=2, ensure_ascii=False)
+            json.dump(ok, f, indent=2, ensure_ascii=False, sort_keys=True)
         with open("out/preview-enrichment/skipped_preview.json", "w", encoding="utf-8") as f:
-            json.dump(skipped, f, indent=2, ensure_ascii=False)
-        # small CSV sample
+            json.dump(skipped, f, indent=2, ensure_ascii=False, sort_keys=True)
+        # small CSV sample: the 20 lowest row indices, without sorting them all
         sample = [["Title","Citation","url"]]
-        for idx in sorted(ok.keys())[:20]:
-            rr = rows[idx]
-            sample.append([rr.get("Title",""), rr.get("Citation",""), rr.get("url","")])
+        for i in heapq.nsmallest(20, ok):
+            rr = rows[i]
+            sample.append([cell(rr, idx, "Title"), cell(rr, idx, "Citation"), rr[url_i]])
         with open("out/preview-enrichment/cases_preview.csv","w",newline="",encoding="utf-8") as f:
             w = csv.writer(f)
             w.writerows(sample)
@@ -1,27 +1,35 @@
 #!/usr/bin/env python3
 import argparse, json, pathlib, sys
 
+_ORJSON_OK = False
+try:
+    import orjson  # type: ignore  # optional: faster pretty-printed output
+    _ORJSON_OK = True
+except Exception:
+    _ORJSON_OK = False
+
 def load_json(path:str):
     p = pathlib.Path(path)
     if not p.exists():
         sys.exit(f"ERROR: Missing {path}")
-    with p.open("r", encoding="utf-8") as f:
-        return json.load(f)
+    # bytes straight to the parser: no intermediate str copy of the file
+    return json.loads(p.read_bytes())
 
 def to_breach_record(c):
     # Map a candidate into Breach-ui schema (category/tag/aliases + provenance)
+    get = c.get  # bound once; called for every provenance field
     return {
         "category": "Litigation / Case Law",
         "tag": "Breach (candidate)",
         "aliases": [],
         "provenance": [{
             "source_type": "Case",
-            "label": c.get("authority_label"),
-            "source_id": c.get("authority_id"),
-            "block_id": c.get("pid"),
-            "page": c.get("page"),
-            "line": c.get("line"),
-            "excerpt": c.get("snippet", "")[:400],
+            "label": get("authority_label"),
+            "source_id": get("authority_id"),
+            "block_id": get("pid"),
+            "page": get("page"),
+            "line": get("line"),
+            "excerpt": get("snippet", "")[:400],
             "confidence": 0.50
         }]
     }
@@ -38,8 +46,12 @@ def main():
 
     outp = pathlib.Path(args.out)
     outp.parent.mkdir(parents=True, exist_ok=True)
-    with outp.open("w", encoding="utf-8") as f:
-        json.dump(breaches, f, ensure_ascii=False, indent=2)
+    if _ORJSON_OK:
+        # same layout as json.dump(indent=2, ensure_ascii=False), UTF-8 bytes
+        outp.write_bytes(orjson.dumps(breaches, option=orjson.OPT_INDENT_2))
+    else:
+        with outp.open("w", encoding="utf-8") as f:
+            json.dump(breaches, f, ensure_ascii=False, indent=2)
 
     print(f"Wrote {len(breaches)} breach records -> {outp}")
 
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 import argparse
+import os
+from itertools import islice
 from pathlib import Path
 
 def extract_lines(source_file: Path, start: int, end: int, output_file: Path):
@@ -7,22 +9,32 @@ def extract_lines(source_file: Path, start: int, end: int, output_file: Path):
     if not source_file.exists():
         raise FileNotFoundError(f"Source file not found: {source_file}")
 
-    with source_file.open("r", encoding="utf-8") as f:
-        lines = f.readlines()
+    if start < 1:
+        raise ValueError(f"Line range {start}-{end} out of bounds")
 
-    if start < 1 or end > len(lines):
-        raise ValueError(f"Line range {start}-{end} out of bounds (file has {len(lines)} lines)")
-
-    selected = [line.strip() for line in lines[start - 1:end]]
-
-    # Write to output file
+    # Stream only the requested slice; the file's length is learnt from how
+    # many lines the slice actually yielded. The slice goes to a sibling temp
+    # file that replaces output_file only once the range proved valid, so a
+    # bad range leaves an earlier run's output alone.
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with output_file.open("w", encoding="utf-8") as out:
-        for line in selected:
-            if line:  # skip empty lines
-                out.write(line + "\n")
-
-    print(f"✅ Extracted {len(selected)} lines from {source_file} → {output_file}")
+    tmp = output_file.with_name(output_file.name + ".tmp")
+    selected = 0
+    try:
+        with source_file.open("r", encoding="utf-8") as f, tmp.open("w", encoding="utf-8") as out:
+            for line in islice(f, start - 1, end):
+                selected += 1
+                line = line.strip()
+                if line:  # skip empty lines
+                    out.write(line + "\n")
+        if selected < end - start + 1:
+            # the file ended inside (or before) the range
+            raise ValueError(f"Line range {start}-{end} out of bounds (file has fewer than {end} lines)")
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    os.replace(tmp, output_file)
+
+    print(f"✅ Extracted {selected} lines from {source_file} → {output_file}")
 
 def main():
     parser = argparse.ArgumentParser(description="Extract a specific line range from a .txt file")
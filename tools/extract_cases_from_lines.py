@@ -9,6 +9,8 @@ Inputs:
   --out PATH           Output CSV path (will be created/overwritten).
   --start-line INT     Inclusive line_no start bound (optional).
   --end-line INT       Inclusive line_no end bound (optional).
+  --server             Load the lines once and serve JSON-lines requests
+                       ({"start", "end", "out"}) from stdin instead.
 
 Output CSV columns (exactly):
   Title,Year,Citation,Jurisdiction,Line
@@ -33,16 +35,25 @@ import argparse
 import csv
 import json
 import re
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
+from util_ltj import iter_ltj_lines
+
 # --- Regexes (careful with flags placement) ---
 
-# Roman numerals line (folio pages like xxxvii). Case-insensitive.
-ROMAN_RE = re.compile(r"(?i)^[ivxlcdm]+\.?\s*$")
+# Roman numerals line (folio pages like xxxvii; case-insensitive): a pure
+# set test. Dotted/dotless capital/small I are included because re's
+# IGNORECASE matched them against 'i' when this was a regex.
+ROMAN_CHARS = frozenset("ivxlcdmIVXLCDM\u0130\u0131")
 
-# Pure page-range rows like '12-23', '7-34', '9-9,10-9, 10-12' etc.
-PAGE_RANGE_RE = re.compile(r"^\s*(\d+\s*(?:-\s*\d+)?)(?:\s*,\s*\d+\s*(?:-\s*\d+)?)*\s*$")
+# Pure page-range row like '12-23', '7-34', '9-9,10-9, 10-12' etc.
+# Only consulted for lines starting with a digit that aren't all digits.
+PAGE_RANGE_RE = re.compile(
+    r"\d+\s*(?:-\s*\d+)?(?:\s*,\s*\d+\s*(?:-\s*\d+)?)*\s*$"
+)
 
 # “Table of Cases” header or obvious section labels we should skip
 SKIP_LABELS = {
@@ -51,17 +62,33 @@ SKIP_LABELS = {
     "cases after pitt v holt",
 }
 
-# Detect a 4-digit year inside [....] or (....)
-BRACKETED_YEAR_RE = re.compile(r"(?P<all>[\[\(]\s*(?P<year>1[89]\d{2}|20\d{2}|2100)\s*[\]\)])")
+# Chapter/section headings that can survive the splitter and look like titles;
+# one alternation so a lowercased title is scanned once, not once per phrase
+SECTION_HEADING_RE = re.compile(
+    "litigation costs|non-party cost orders|responses and evidence|documents disclosable"
+)
 
-# Some report tokens when no bracketed year exists (we keep these as citation if present)
+# Detect a 4-digit year inside [....] or (....)
+# (only the year group and the match span are read; no other groups are captured)
+BRACKETED_YEAR_RE = re.compile(r"[\[\(]\s*(?P<year>1[89]\d{2}|20\d{2}|2100)\s*[\]\)]")
+
+# Some report tokens when no bracketed year exists (we keep these as citation if present):
+#   JRC JLR JCA WLR AC QB Ch Fam EWCA EWHC UKSC UKPC PC All ER Lloyd's Rep BCLC
+#   CA HL QBD KB CP SCC SCR
+# Written as a prefix tree (shared leading letters factored out) so each
+# position tries one branch per first letter instead of every token in turn.
+# Only the match start is used (the citation is sliced from there), so the
+# pattern stops at the token rather than running on to the end of the line.
 REPORT_TOKEN_RE = re.compile(
-    r"\b("
-    r"JRC|JLR|JCA|WLR|AC|QB|Ch|Fam|EWCA|EWHC|UKSC|UKPC|PC|All\s*ER|Lloyd'?s\s*Rep|BCLC|"
-    r"JCA|CA|HL|PC|QBD|KB|CP|SCC|SCR"
-    r")\b.*", re.IGNORECASE
+    r"\b(?:"
+    r"A(?:C|ll\s*ER)|BCLC|C(?:A|P|h)|EW(?:CA|HC)|Fam|HL|J(?:CA|LR|RC)|KB|"
+    r"Lloyd'?s\s*Rep|PC|QBD?|SC[CR]|UK(?:PC|SC)|WLR"
+    r")\b", re.IGNORECASE
 )
 
+# Separators trimmed from either side of a title/citation split
+SPLIT_PUNCT = " ,;:-\u2013\u2014"
+
 # Titles that begin with “Re …”, “In re …”, “In the matter of …”
 RE_BEGIN_RE = re.compile(r"(?i)^\s*(in\s+the\s+matter\s+of|in\s+re|re)\b")
 
@@ -69,13 +96,30 @@ RE_BEGIN_RE = re.compile(r"(?i)^\s*(in\s+the\s+matter\s+of|in\s+re|re)\b")
 COMMA_RE_RE = re.compile(r"(?i)^\s*(?P<name>.+?)\s*,\s*re\b")
 
 
+ASCII_LETTERS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+
+
+def has_letter(t: str) -> bool:
+    """any(ch.isalpha() for ch in t), with the common all-ASCII case done as a C-level set test."""
+    if t.isascii():
+        return not ASCII_LETTERS.isdisjoint(t)
+    return any(ch.isalpha() for ch in t)
+
+
+def is_folio_or_pages(t: str) -> bool:
+    """Stripped, non-empty t is a roman folio ('xxxvii', 'iv.') or a page-range row."""
+    if t[0].isdecimal():
+        # a plain page number needs no regex; ranges/lists still do
+        return t.isdecimal() or PAGE_RANGE_RE.match(t) is not None
+    r = t[:-1] if t[-1] == "." else t
+    return bool(r) and ROMAN_CHARS.issuperset(r)
+
+
 def is_skip_line(text: str) -> bool:
     t = text.strip()
     if not t:
         return True
-    if ROMAN_RE.match(t):
-        return True
-    if PAGE_RANGE_RE.match(t):
+    if is_folio_or_pages(t):
         return True
     t_low = t.lower()
     if t_low in SKIP_LABELS:
@@ -86,6 +130,9 @@ def is_skip_line(text: str) -> bool:
     return False
 
 
+# Pure function of the line text; index pages repeat the same case line many
+# times, so repeats are served from a per-process cache.
+@lru_cache(maxsize=65536)
 def split_title_year_citation(text: str) -> Tuple[str, str, str]:
     """
     Extract (Title, Year, Citation) from a case line.
@@ -109,31 +156,34 @@ def split_title_year_citation(text: str) -> Tuple[str, str, str]:
     m_year = BRACKETED_YEAR_RE.search(s)
     if m_year:
         year = m_year.group("year")
-        # Title is everything before the bracket start
-        title_raw = s[:m_year.start()].rstrip(" ,;:-\u2013\u2014").strip()
+        ys = m_year.start()
+        # Title is everything before the bracket start. s has no leading
+        # whitespace, so only the right end of each title needs trimming.
+        title = s[:ys].rstrip(SPLIT_PUNCT).rstrip()
         # Citation is everything after the bracketed year group
-        citation = s[m_year.end():].strip(" ,;:-\u2013\u2014")
+        citation = s[m_year.end():].strip(SPLIT_PUNCT)
         # If citation is empty but there are visible report tokens before year,
         # move them to citation (rare, but guard anyway).
         if not citation:
-            before = s[:m_year.start()]
-            m_rep_before = REPORT_TOKEN_RE.search(before)
+            # endpos instead of slicing out the text before the year
+            m_rep_before = REPORT_TOKEN_RE.search(s, 0, ys)
             if m_rep_before:
                 # Title should end before the token
-                title_raw = before[:m_rep_before.start()].rstrip(" ,;:-\u2013\u2014").strip()
-                citation = before[m_rep_before.start():].strip(" ,;:-\u2013\u2014")
-        title = title_raw
+                rs = m_rep_before.start()
+                title = s[:rs].rstrip(SPLIT_PUNCT).rstrip()
+                citation = s[rs:ys].strip(SPLIT_PUNCT)
         return (title, year, citation)
 
     # No bracketed/parenthesized year: try to split on first obvious report token
     m_rep = REPORT_TOKEN_RE.search(s)
     if m_rep:
-        title = s[:m_rep.start()].rstrip(" ,;:-\u2013\u2014").strip()
-        citation = s[m_rep.start():].strip(" ,;:-\u2013\u2014")
+        rs = m_rep.start()
+        title = s[:rs].rstrip(SPLIT_PUNCT).rstrip()
+        citation = s[rs:].strip(SPLIT_PUNCT)
         return (title, "", citation)
 
     # Otherwise we keep the whole thing as title (no fabricated fields)
-    return (s.rstrip(" ,;:-\u2013\u2014"), "", "")
+    return (s.rstrip(SPLIT_PUNCT), "", "")
 
 
 def looks_like_case_title(title: str) -> bool:
@@ -147,7 +197,7 @@ def looks_like_case_title(title: str) -> bool:
     t = title.strip()
     if len(t) < 2:
         return False
-    if not any(ch.isalpha() for ch in t):
+    if not has_letter(t):
         return False
     if t.lower() in {"v", "v.", "re"}:
         return False
@@ -158,21 +208,29 @@ def extract_from_lines(lines_json_path: Path,
                        out_csv_path: Path,
                        start_line: Optional[int],
                        end_line: Optional[int]) -> int:
-    data = json.loads(Path(lines_json_path).read_text(encoding="utf-8"))
+    # streamed, so an NDJSON input is never held in memory whole
+    data = iter_ltj_lines(lines_json_path)
+    return extract_from_data(data, out_csv_path, start_line, end_line)
 
+
+def extract_from_data(data,
+                      out_csv_path: Path,
+                      start_line: Optional[int],
+                      end_line: Optional[int]) -> int:
     # Expect a list of {"line_no": int, "text": str}
     rows_out = []
+    add_row = rows_out.append
+    # open bounds become infinities, so the range test is one chained comparison
+    lo = float("-inf") if start_line is None else start_line
+    hi = float("inf") if end_line is None else end_line
     for item in data:
         try:
             line_no = int(item.get("line_no"))
         except Exception:
             continue
-        text = (item.get("text") or "").strip()
-
-        if start_line is not None and line_no < start_line:
-            continue
-        if end_line is not None and line_no > end_line:
+        if not lo <= line_no <= hi:
             continue
+        text = (item.get("text") or "").strip()
         if is_skip_line(text):
             continue
 
@@ -183,39 +241,62 @@ def extract_from_lines(lines_json_path: Path,
             continue
 
         # Skip obvious chapter/section lines that slipped through
-        low = title.lower()
-        if any(kw in low for kw in ["litigation costs", "non-party cost orders",
-                                    "responses and evidence", "documents disclosable"]):
+        if SECTION_HEADING_RE.search(title.lower()):
             # these look like section headings, not cases
             continue
 
-        rows_out.append({
-            "Title": title,
-            "Year": year,
-            "Citation": citation,
-            "Jurisdiction": "",   # populate later
-            "Line": line_no,
-        })
+        # Title, Year, Citation, Jurisdiction (populated later), Line
+        add_row((title, year, citation, "", line_no))
 
     # Write CSV
     out_csv_path.parent.mkdir(parents=True, exist_ok=True)
     with out_csv_path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["Title", "Year", "Citation", "Jurisdiction", "Line"])
-        w.writeheader()
-        for r in rows_out:
-            w.writerow(r)
+        w = csv.writer(f)
+        w.writerow(["Title", "Year", "Citation", "Jurisdiction", "Line"])
+        w.writerows(rows_out)
 
     return len(rows_out)
 
 
+def serve(lines_json_path: Path) -> None:
+    """
+    Batch mode for drivers that extract many windows: LTJ.lines.json is parsed
+    once and the compiled patterns/parser cache stay warm between requests.
+    Each stdin line is a JSON request; one JSON result line is printed per request.
+    """
+    # held as a list: every request walks the lines again
+    data = list(iter_ltj_lines(lines_json_path))
+    for raw in sys.stdin:
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            req = json.loads(raw)
+            out = req["out"]
+            n = extract_from_data(data, Path(out), req.get("start"), req.get("end"))
+            resp = {"ok": True, "out": out, "rows": n}
+        except Exception as e:
+            resp = {"ok": False, "error": str(e)}
+        print(json.dumps(resp), flush=True)
+
+
 def main():
     ap = argparse.ArgumentParser(description="Extract cases.csv from LTJ.lines.json")
     ap.add_argument("--ltj-lines", required=True, help="Path to LTJ-ui/out/LTJ.lines.json")
-    ap.add_argument("--out", required=True, help="Output CSV path (will be overwritten)")
+    ap.add_argument("--out", help="Output CSV path (will be overwritten)")
     ap.add_argument("--start-line", type=int, default=None, help="Inclusive start line_no")
     ap.add_argument("--end-line", type=int, default=None, help="Inclusive end line_no")
+    ap.add_argument("--server", action="store_true",
+                    help="Load the lines once, then read one JSON request per stdin line: "
+                         '{"start": int|null, "end": int|null, "out": path}')
     args = ap.parse_args()
 
+    if args.server:
+        serve(Path(args.ltj_lines))
+        return
+    if not args.out:
+        ap.error("--out is required unless --server is given")
+
     n = extract_from_lines(Path(args.ltj_lines),
                            Path(args.out),
                            args.start_line,
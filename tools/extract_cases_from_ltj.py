@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
-import argparse, json, re, csv, sys
+import argparse, re, csv, sys
 from pathlib import Path
 
+from util_ltj import iter_ltj_lines
+
 CASE_ROW = ["case_id","title","citation","year","jurisdiction","url","source_line"]
 
 # Patterns:
@@ -10,26 +12,31 @@ CASE_ROW = ["case_id","title","citation","year","jurisdiction","url","source_lin
 #  - We ignore bare page lists like "12-23" etc.
 re_pages_tail = re.compile(r'\s*,\s*\d{1,3}(?:-\d{1,3})?(?:\s*,\s*\d{1,3}(?:-\d{1,3})?)*\s*$')
 re_year = re.compile(r'\[(\d{4})\]')
-# For “looks like” a case: has a bracketed year and at least one capital word + " v " or "Re " etc.
-re_looks_case = re.compile(r'(?:\bRe\b|\bv\b|\bIn re\b|\bR\b)\s', re.I)
+re_pages_only = re.compile(r'\d{1,3}(?:-\d{1,3})?(?:,\s*\d{1,3}(?:-\d{1,3})?)*')
+# Some lists include single-party titles: accept if there's a bracket + law report token
+REPORT_TOKENS = ('JRC','JLR','EWHC','EWCA','UKSC','UKPC','WLR','All ER','AC','QB','Ch','Fam','BCLC','Lloyd\'s Rep')
+# For “looks like” a case: has a bracketed year and either a party marker
+# (" v ", "Re ", "In re ", "R "; any case) or one of the report tokens.
+# Both kinds sit in one union pattern, so a line is scanned once, not twice.
+re_case_marker = re.compile(
+    r'(?i:\bRe\b|\bv\b|\bIn re\b|\bR\b)\s|' + '|'.join(map(re.escape, REPORT_TOKENS))
+)
 
-def looks_like_case(text:str)->bool:
-    if not re_year.search(text): 
+def looks_like_case(text:str, year_m=None)->bool:
+    """year_m: the re_year match the caller already found in text, if any."""
+    if not (year_m or re_year.search(text)):
         return False
-    if re_looks_case.search(text):
-        return True
-    # Some lists include single-party titles: accept if there's a bracket + law report token
-    tokens = ['JRC','JLR','EWHC','EWCA','UKSC','UKPC','WLR','All ER','AC','QB','Ch','Fam','BCLC','Lloyd\'s Rep']
-    return any(t in text for t in tokens)
+    return re_case_marker.search(text) is not None
 
 def strip_trailing_pages(text:str)->str:
     return re_pages_tail.sub('', text).strip()
 
-def split_title_citation(text:str):
+def split_title_citation(text:str, m=None):
     """
     Split at the first bracketed year to separate title vs citation.
+    m: that year's re_year match, if the caller already has it.
     """
-    m = re_year.search(text)
+    m = m or re_year.search(text)
     if not m:
         return text.strip(), "", None
     year = m.group(1)
@@ -43,16 +50,20 @@ def parse_cases(lines, start, end, max_n=0):
     n = 0
     for obj in lines:
         ln = obj.get("line_no") or obj.get("line") or obj.get("no") or obj.get("lineNo")
-        txt = obj.get("text","").strip()
         if ln is None or not (start <= int(ln) <= end):
             continue
+        # stripped only once the line is known to be in range
+        txt = obj.get("text","").strip()
         # skip pure page ranges like "12-23"
-        if re.fullmatch(r'\d{1,3}(?:-\d{1,3})?(?:,\s*\d{1,3}(?:-\d{1,3})?)*', txt):
+        if re_pages_only.fullmatch(txt):
             continue
-        if not looks_like_case(txt):
+        # one year search per line: the page tail stripped below holds only
+        # digits, commas and dashes, so the match stays valid on `cleaned`
+        year_m = re_year.search(txt)
+        if not year_m or not looks_like_case(txt, year_m):
             continue
         cleaned = strip_trailing_pages(txt)
-        title, citation, year = split_title_citation(cleaned)
+        title, citation, year = split_title_citation(cleaned, year_m)
         if not title or not citation:
             # keep, but mark citation empty if weird line; we want zero drops
             pass
@@ -61,15 +72,8 @@ def parse_cases(lines, start, end, max_n=0):
         if "JRC" in citation or "JLR" in citation:
             juris = "Jersey"
         case_id = f"LTJ_{ln}"
-        out.append({
-            "case_id": case_id,
-            "title": title,
-            "citation": citation,
-            "year": year or "",
-            "jurisdiction": juris,
-            "url": "",
-            "source_line": ln
-        })
+        # one tuple per row, in CASE_ROW column order
+        out.append((case_id, title, citation, year or "", juris, "", ln))
         n += 1
         if max_n and n >= max_n:
             break
@@ -84,25 +88,18 @@ def main():
     ap.add_argument("--max", type=int, default=0)
     args = ap.parse_args()
 
-    with open(args.ltj_lines, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    # LTJ.lines.json is usually an array of objects
-    if isinstance(data, dict) and "lines" in data:
-        lines = data["lines"]
-    elif isinstance(data, list):
-        lines = data
-    else:
-        print("Unrecognised LTJ lines structure", file=sys.stderr)
+    # LTJ.lines.json is usually an array of objects; read lazily, so --max
+    # stops reading the file as soon as enough rows are found
+    try:
+        rows = parse_cases(iter_ltj_lines(args.ltj_lines), args.start, args.end, max_n=args.max)
+    except ValueError as e:
+        print(e, file=sys.stderr)
         sys.exit(1)
-
-    rows = parse_cases(lines, args.start, args.end, max_n=args.max)
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
     with open(args.out, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=CASE_ROW)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w = csv.writer(f)
+        w.writerow(CASE_ROW)
+        w.writerows(rows)
     print(f"Wrote {len(rows)} rows -> {args.out}")
 
 if __name__ == "__main__":
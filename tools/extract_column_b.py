@@ -11,27 +11,29 @@ If a proper case citation like "[2010] EWHC 123" is present, we keep up to the
 end of that citation, then trim any trailing comma/range noise.
 """
 
-import argparse, json, csv, re
+import argparse, csv, re
 from pathlib import Path
 
+from util_ltj import iter_ltj_lines
+
 # detects a law-style citation like [2014] EWCA Civ 123, [1996] 1 AC 123, etc.
 CITATION = re.compile(r"\[[0-9]{4}[^\]]*\]")
 
 # trims trailing index/page blobs like ", 1-2, 3-4" or "; 12-23"
 TRAILING_RANGES = re.compile(r"[,;]\s*(pp?\.\s*)?\d+(?:-\d+)?(?:\s*,\s*\d+(?:-\d+)?)*\s*$", re.IGNORECASE)
 
-def load_lines(path: Path):
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-    # accept either {"lines":[...]} or raw list
-    if isinstance(data, dict) and "lines" in data:
-        data = data["lines"]
-    return [
-        {"line_no": int(item.get("line") or item.get("line_no") or item.get("lineno")),
-         "text": (item.get("text") or item.get("content") or item.get("line_text") or "").strip()}
-        for item in data
-        if isinstance(item, dict)
-    ]
+def load_lines(path: Path, start=None, end=None):
+    """Yield {"line_no", "text"} for entries with start <= line_no <= end (bounds optional)."""
+    # accepts a raw list, {"lines":[...]} or NDJSON (streamed); one lazy pass:
+    # out-of-range entries are never stripped or built into rows
+    for item in iter_ltj_lines(path):
+        if not isinstance(item, dict):
+            continue
+        line_no = int(item.get("line") or item.get("line_no") or item.get("lineno"))
+        if (start is not None and line_no < start) or (end is not None and line_no > end):
+            continue
+        yield {"line_no": line_no,
+               "text": (item.get("text") or item.get("content") or item.get("line_text") or "").strip()}
 
 def to_title(raw: str) -> str:
     if not raw:
@@ -52,17 +54,13 @@ def main():
     args = ap.parse_args()
 
     src = Path(args.ltj_lines)
-    rows = load_lines(src)
-
-    # Optional slicing by line_no
-    if args.start is not None:
-        rows = [r for r in rows if r["line_no"] >= args.start]
-    if args.end is not None:
-        rows = [r for r in rows if r["line_no"] <= args.end]
+    # optional slicing by line_no happens while loading
+    rows = load_lines(src, args.start, args.end)
 
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
+    written = 0
     with out_path.open("w", encoding="utf-8", newline="") as f:
         w = csv.writer(f)
         w.writerow(["line_no", "raw", "title"])
@@ -73,8 +71,9 @@ def main():
             if not title or title.isdigit():
                 continue
             w.writerow([r["line_no"], raw, title])
+            written += 1
 
-    print(f"✓ Wrote {out_path} ({sum(1 for _ in out_path.open())-1} rows)")
+    print(f"✓ Wrote {out_path} ({written} rows)")
 
 if __name__ == "__main__":
     main()
@@ -6,7 +6,6 @@ import requests
 HDRS = {"User-Agent":"CourtFirst/1.0 (+GitHub Actions; requests)"}
 
 def sha256_bytes(b: bytes) -> str:
-    import hashlib
     return hashlib.sha256(b).hexdigest()
 
 def fname_safe(s: str) -> str:
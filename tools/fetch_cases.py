@@ -13,60 +13,166 @@ Outputs:
 
 We never invent content: we save exactly the server response text on 200;
 non-200 (or exceptions) are recorded in the report and that case is skipped.
+
+Hosts are fetched concurrently (--workers), but requests to any one host stay
+sequential with the same polite pause between them.
+
+Reruns revalidate against DIR/.http_cache.json (ETag / Last-Modified per saved file):
+a 304 keeps the saved file, and a 200 whose body hashes the same as last time
+does not rewrite it.
 """
 
 from pathlib import Path
 import argparse
+import hashlib
+import json
+import os
 import requests
-from typing import Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple
+from urllib.parse import urlparse
+
+from tools.util import read_csv, ensure_dir, safe_filename, HDRS, sleep_jitter, save_json
+
+CACHE_NAME = ".http_cache.json"
 
-from tools.util import read_csv, ensure_dir, safe_filename, http_get, sleep_jitter, save_json
+def load_cache(path: Path) -> Dict[str, Dict[str, str]]:
+    try:
+        with path.open(encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # entries without a url are from the old per-URL layout; drop them
+    return {k: v for k, v in cache.items() if "url" in v}
+
+def save_html(path: Path, data: bytes) -> None:
+    """Write already-encoded HTML via a temp file + rename, so a crash never leaves half a page."""
+    tmp = f"{path}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        # os.write may write less than asked (e.g. near a full disk): loop
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    except OSError:
+        os.close(fd)
+        os.unlink(tmp)  # don't leave a partial temp file behind
+        raise
+    os.close(fd)
+    os.replace(tmp, path)
+
+def fetch_one(session: requests.Session, case_id: str, url: str, html_dir: Path,
+              cache: Dict[str, Dict[str, str]], writer: ThreadPoolExecutor,
+              writes: List[Tuple[Dict[str, Any], Future]]) -> Dict[str, Any]:
+    """Fetch one case page; a changed 200 body is queued on writer and the
+    (record, future) pair appended to writes for main() to check."""
+    rec = {"case_id": case_id, "url": url}
+    outp = html_dir / safe_filename(f"{case_id}.html")
+    # keyed by the saved file, not the URL: two case_ids sharing a URL each
+    # revalidate their own copy
+    prev = cache.get(outp.name, {}) if outp.exists() else {}
+    if prev.get("url") != url:
+        prev = {}  # the case now points somewhere else
+    cond = {}
+    if prev.get("etag"):
+        cond["If-None-Match"] = prev["etag"]
+    if prev.get("last_modified"):
+        cond["If-Modified-Since"] = prev["last_modified"]
+    try:
+        r = session.get(url, headers=cond, timeout=20)
+        if r.status_code == 304 and prev:
+            # unchanged upstream: the file on disk is still the server's text
+            rec.update({"status": 304, "html_file": str(outp)})
+        elif r.status_code == 200 and r.text:
+            # encode once: the same bytes are hashed and written
+            data = r.text.encode("utf-8", errors="ignore")
+            digest = hashlib.sha1(data).hexdigest()
+            if digest != prev.get("sha1"):
+                writes.append((rec, writer.submit(save_html, outp, data)))
+            cache[outp.name] = {
+                "url": url,
+                "etag": r.headers.get("ETag", ""),
+                "last_modified": r.headers.get("Last-Modified", ""),
+                "sha1": digest,
+            }
+            rec.update({"status": 200, "html_file": str(outp)})
+        else:
+            rec.update({"status": r.status_code, "error": "non-200 or empty body"})
+    except Exception as e:
+        rec.update({"status": None, "error": str(e)})
+    return rec
+
+def fetch_host(jobs: List[Tuple[int, str, str]], html_dir: Path,
+               cache: Dict[str, Dict[str, str]], writer: ThreadPoolExecutor,
+               writes: List[Tuple[Dict[str, Any], Future]]) -> List[Tuple[int, Dict[str, Any]]]:
+    """Fetch one host's cases in order, pausing between calls (one session per host)."""
+    session = requests.Session()
+    session.headers.update(HDRS)
+    out = []
+    for idx, case_id, url in jobs:
+        out.append((idx, fetch_one(session, case_id, url, html_dir, cache, writer, writes)))
+        sleep_jitter(0.9)
+    return out
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--in", dest="in_csv", required=True)
     ap.add_argument("--html", dest="html_dir", required=True)
     ap.add_argument("--report", dest="report_json", required=True)
+    ap.add_argument("--workers", type=int, default=8, help="hosts fetched in parallel")
     args = ap.parse_args()
 
     in_path = Path(args.in_csv)
     html_dir = Path(args.html_dir)
     ensure_dir(html_dir)
     report_path = Path(args.report_json)
+    cache_path = html_dir / CACHE_NAME
+    cache = load_cache(cache_path)
 
     hmap, rows = read_csv(in_path)
     if not {"case_id", "source_url"}.issubset(hmap.keys()):
         raise ValueError("Input must have columns: case_id, source_url")
 
-    session = requests.Session()
-    results: Dict[str, Any] = {"ok": [], "failed": []}
-
-    for row in rows:
+    by_host: Dict[str, List[Tuple[int, str, str]]] = {}
+    for idx, row in enumerate(rows):
         case_id = row[hmap["case_id"]].strip()
         url = row[hmap["source_url"]].strip()
         if not case_id or not url:
             continue
+        by_host.setdefault(urlparse(url).netloc.lower(), []).append((idx, case_id, url))
 
-        rec = {"case_id": case_id, "url": url}
+    # one slot per input row: records land at their row index, so the report
+    # comes out in input order without sorting
+    done: List[Any] = [None] * len(rows)
+    # page writes go to their own small pool so a host's next request doesn't
+    # wait on the disk; list.append is atomic, so fetch threads share `writes`
+    writes: List[Tuple[Dict[str, Any], Future]] = []
+    with ThreadPoolExecutor(max_workers=4) as writer:
+        if by_host:
+            with ThreadPoolExecutor(max_workers=max(1, min(args.workers, len(by_host)))) as pool:
+                # cache entries are per saved file, and each row is fetched by one worker
+                for recs in pool.map(lambda jobs: fetch_host(jobs, html_dir, cache, writer, writes),
+                                     by_host.values()):
+                    for idx, rec in recs:
+                        done[idx] = rec
+
+    # leaving the writer block waited for every write; a page whose write
+    # failed is reported as failed, and not cached
+    for rec, fut in writes:
         try:
-            status, text = http_get(url, session)
-            if status == 200 and text:
-                fname = safe_filename(f"{case_id}.html")
-                outp = html_dir / fname
-                with outp.open("w", encoding="utf-8", errors="ignore") as f:
-                    f.write(text)
-                rec.update({"status": status, "html_file": str(outp)})
-                results["ok"].append(rec)
-            else:
-                rec.update({"status": status, "error": "non-200 or empty body"})
-                results["failed"].append(rec)
-        except Exception as e:
-            rec.update({"status": None, "error": str(e)})
-            results["failed"].append(rec)
+            fut.result()
+        except OSError as e:
+            cache.pop(Path(rec.pop("html_file")).name, None)
+            rec["error"] = f"write failed: {e}"
 
-        sleep_jitter(0.9)
+    # report in input order, as before
+    results: Dict[str, Any] = {"ok": [], "failed": []}
+    for rec in done:
+        if rec is not None:
+            results["ok" if "html_file" in rec else "failed"].append(rec)
 
     save_json(results, report_path)
+    save_json(cache, cache_path)
 
 if __name__ == "__main__":
     main()
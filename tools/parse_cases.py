@@ -2,6 +2,7 @@ import os, json, re
 from bs4 import BeautifulSoup  # needs beautifulsoup4 in requirements.txt
 
 NEUTRAL_RE = re.compile(r"\[(\d{4})\]\s+[A-Z][A-Z0-9]+(?:\s+\d+)?", re.I)
+DATE_RE = re.compile(r"\b\d{1,2}\s+\w+\s+\d{4}\b")  # e.g., 12 March 2019
 
 def parse_meta(html: str):
     soup = BeautifulSoup(html, "html.parser")
@@ -14,23 +15,25 @@ def parse_meta(html: str):
             title = el.get_text(" ", strip=True)
             break
 
-    # date (very heuristic)
-    date = None
-    date_el = soup.find(text=re.compile(r"\b\d{1,2}\s+\w+\s+\d{4}\b"))  # e.g., 12 March 2019
-    if date_el:
-        m = re.search(r"\b\d{1,2}\s+\w+\s+\d{4}\b", date_el)
-        if m: date = m.group(0)
-
-    # neutral citation (heuristic)
+    # neutral citation (heuristic): title first, else the first 2000 chars of text
     neutral = None
     if title:
         m = NEUTRAL_RE.search(title)
         if m:
             neutral = m.group(0)
+
+    # date (very heuristic) and the body-text citation, from one copy of the page text.
+    # Separate searches: a citation like "[2019] JRC 12" must not consume the
+    # day of a following "12 March 2019"
+    body_text = soup.get_text(" ", strip=True)
+    date = None
+    m = DATE_RE.search(body_text)
+    if m:
+        date = m.group(0)
     if not neutral:
-        body_text = soup.get_text(" ", strip=True)[:2000]
-        m = NEUTRAL_RE.search(body_text)
-        if m: neutral = m.group(0)
+        m = NEUTRAL_RE.search(body_text, 0, 2000)
+        if m:
+            neutral = m.group(0)
 
     # court (best-effort: BAILII often shows in breadcrumbs or h2/h3)
     court = None
@@ -16,14 +16,24 @@ Heuristics:
     'Order', 'Result', 'Decision', 'Outcome' (case-insensitive).
   - Capture up to ~800 chars following each heading as a snippet.
 We DO NOT fabricate anything. If nothing matches, the record has no 'snippets'.
+
+Pages are parsed in --workers processes (default: one per CPU; 1 parses
+in-process, which is also the fallback if the pool breaks). Records are
+appended to <out>.ndjson in file order as they come back and only joined into
+the final JSON array at the end (pretty-printed, as save_json writes it), so
+memory does not grow with the corpus.
 """
 
 from pathlib import Path
 import argparse
+import json
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from bs4 import BeautifulSoup
 
-from tools.util import load_json, save_json
+from tools.util import ensure_dir, load_json
 
 HEADERS = [
     r"\bHeld\b",
@@ -37,27 +47,45 @@ HEADERS = [
     r"\bOutcome\b",
 ]
 HEADER_RE = re.compile("|".join(HEADERS), re.IGNORECASE)
+WS_RE = re.compile(r"\s+")
 
 def harvest_snippets(text: str, maxlen: int = 800):
     out = []
-    for m in HEADER_RE.finditer(text):
+    # one scan for all headings; each snippet stops at the next heading
+    matches = list(HEADER_RE.finditer(text))
+    for i, m in enumerate(matches):
         start = m.end()
-        snippet = text[start:start + maxlen].strip()
-        # stop at next header if present
-        nxt = HEADER_RE.search(snippet)
-        if nxt:
-            snippet = snippet[:nxt.start()].strip()
+        stop = start + maxlen
+        if i + 1 < len(matches):
+            stop = min(stop, matches[i + 1].start())
         # collapse whitespace
-        snippet = re.sub(r"\s+", " ", snippet)
+        snippet = WS_RE.sub(" ", text[start:stop].strip())
         if snippet:
             out.append({"heading": m.group(0), "snippet": snippet})
     return out
 
+def parse_file(path: Path, source_url=None) -> str:
+    """Parse one saved page into its JSON line (runs in a worker process)."""
+    try:
+        html = path.read_text(encoding="utf-8", errors="ignore")
+        soup = BeautifulSoup(html, "html.parser")
+        title = soup.title.get_text(strip=True) if soup.title else None
+        text = soup.get_text(separator=" ", strip=True)
+        snippets = harvest_snippets(text)
+        rec = {"case_file": path.name}
+        if title: rec["title"] = title
+        if source_url: rec["source_url"] = source_url
+        if snippets: rec["snippets"] = snippets
+    except Exception as e:
+        rec = {"case_file": path.name, "error": str(e)}
+    return json.dumps(rec, ensure_ascii=False, separators=(",", ":")) + "\n"
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--html", required=True, help="directory with fetched HTML")
     ap.add_argument("--report", required=True, help="fetch_report.json")
     ap.add_argument("--out", required=True, help="outcomes.json")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parser processes")
     args = ap.parse_args()
 
     html_dir = Path(args.html)
@@ -69,23 +97,41 @@ def main():
         if fn:
             url_by_file[fn] = ok.get("url")
 
-    records = []
-    for path in sorted(html_dir.glob("*.html")):
-        try:
-            html = path.read_text(encoding="utf-8", errors="ignore")
-            soup = BeautifulSoup(html, "html.parser")
-            title = soup.title.get_text(strip=True) if soup.title else None
-            text = soup.get_text(separator=" ", strip=True)
-            snippets = harvest_snippets(text)
-            rec = {"case_file": path.name}
-            if title: rec["title"] = title
-            if url_by_file.get(path.name): rec["source_url"] = url_by_file[path.name]
-            if snippets: rec["snippets"] = snippets
-            records.append(rec)
-        except Exception as e:
-            records.append({"case_file": path.name, "error": str(e)})
+    out_path = Path(args.out)
+    ensure_dir(out_path.parent)
+    nd_path = out_path.with_name(out_path.name + ".ndjson")
+    paths = sorted(html_dir.glob("*.html"))
+    urls = [url_by_file.get(p.name) for p in paths]
+    # parsing is CPU-bound and independent per page; map() keeps file order.
+    # parse_file catches its own errors, so anything raised here comes from the
+    # pool itself: a worker died (BrokenProcessPool) or a job/result could not be
+    # pickled (PicklingError, or the AttributeError/TypeError pickle raises for
+    # local objects). Start the log over and parse in this process instead.
+    with nd_path.open("w", encoding="utf-8") as nd:
+        if args.workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=args.workers) as pool:
+                    nd.writelines(pool.map(parse_file, paths, urls, chunksize=8))
+            except Exception as e:
+                print(f"parse_outcomes: worker pool failed ({e!r}); parsing in-process",
+                      file=sys.stderr)
+                nd.seek(0)
+                nd.truncate()
+                nd.writelines(map(parse_file, paths, urls))
+        else:
+            nd.writelines(map(parse_file, paths, urls))
 
-    save_json(records, Path(args.out))
+    # stream the line log into one JSON array, then swap it into place; each
+    # record is re-indented so the file matches save_json(records) byte for byte
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+    with nd_path.open(encoding="utf-8") as src, tmp_path.open("w", encoding="utf-8") as dst:
+        n = 0
+        for n, line in enumerate(src, 1):
+            rec = json.dumps(json.loads(line), indent=2, ensure_ascii=False)
+            dst.write(("[\n  " if n == 1 else ",\n  ") + rec.replace("\n", "\n  "))
+        dst.write("\n]" if n else "[]")
+    os.replace(tmp_path, out_path)
+    nd_path.unlink()
 
 if __name__ == "__main__":
     main()
@@ -16,15 +16,25 @@ Usage:
 """
 
 import argparse, csv, json, re
+from functools import lru_cache
 from pathlib import Path
 
+from util_ltj import iter_ltj_lines
+
 CASE_ROW_COLS = ["case_id","Title","Year","Citation","Jurisdiction","Line"]
 
 # very broad reporter tokens; extend as needed
 REPORTER_TOKENS = r"(JLR|JRC|EWHC|EWCA|UKPC|AC|WLR|All ER|JCA|PC|JCPC)"
 YEAR = r"\[[12][0-9]{3}\]"
 # Grab title up to a year/citation; leave page refs intact for now (we'll clean later)
-TITLE_PAT = re.compile(r"^(?P<title>.+?\s" + YEAR + r"(?:\s[^,]*)?)", re.IGNORECASE)
+TITLE_PAT = re.compile(r"^(?P<title>.+?\s(?P<year>" + YEAR + r")(?:\s[^,]*)?)", re.IGNORECASE)
+YEAR_RE = re.compile(YEAR)
+ID_UNSAFE_RE = re.compile(r"[^A-Za-z0-9]+")
+
+@lru_cache(maxsize=None)
+def citation_re(year):
+    """'[year] XX ...' citation pattern; one compiled regex per distinct year."""
+    return re.compile(r"\[" + year + r"\]\s+([A-Z]{2,5})\s+[0-9A-Za-z/ ]+")
 
 def guess_jurisdiction(text):
     t = text.upper()
@@ -38,9 +48,19 @@ def guess_jurisdiction(text):
 
 def parse_line(line_no, text):
     """
-    Return dict with Title/Year/Citation/Jurisdiction/Line if it looks like a case line,
-    else None.
+    Return a row tuple in CASE_ROW_COLS order (case_id, Title, Year, Citation,
+    Jurisdiction, Line) if it looks like a case line, else None.
     """
+    body = _parse_body(text)
+    if body is None:
+        return None
+    return body + (str(line_no),)
+
+
+# Only depends on the text, and the same case line recurs across index pages,
+# so repeats come from a per-process cache (rows are tuples, safe to share).
+@lru_cache(maxsize=65536)
+def _parse_body(text):
     # Common junk to skip
     tt = text.strip().strip("•–-·")
     if not tt:
@@ -50,33 +70,38 @@ def parse_line(line_no, text):
     if not m:
         return None
 
-    title = m.group("title").strip()
-    # try to split out Year & Citation (loose heuristic)
-    year_m = re.search(YEAR, title)
-    year = year_m.group(0).strip("[]") if year_m else ""
+    raw = m.group("title")
+    title = raw.strip()
+    # try to split out Year & Citation (loose heuristic). TITLE_PAT has already
+    # found a year; only a '[' before it can hide an earlier one.
+    ys = m.start("year")
+    if "[" in raw[:ys]:
+        ys = YEAR_RE.search(raw).start()
+    year = raw[ys + 1:ys + 5]
 
     citation = ""
-    # e.g. "... [2015] JRC 186" or "... [2014] JLR 305"
-    cit_m = re.search(r"\[" + year + r"\]\s+([A-Z]{2,5})\s+[0-9A-Za-z/ ]+", title) if year else None
+    # e.g. "... [2015] JRC 186" or "... [2014] JLR 305"; no "[year]" starts before ys
+    lead = len(raw) - len(raw.lstrip())  # where title starts inside raw
+    cit_m = citation_re(year).search(title, ys - lead)
     if cit_m:
-        idx = title.find("[" + year + "]")
+        # the first "[year]" in title is the one at ys: slice there, no find()
+        idx = ys - lead
         citation = title[idx:].strip()
         title = title[:idx].rstrip()
 
     jurisdiction = guess_jurisdiction(tt)
 
     # Build a stable-ish id: YEAR + first 30 chars normalized
-    base = re.sub(r"[^A-Za-z0-9]+", "_", (title + "_" + (citation or "")))[:30].strip("_")
+    base = ID_UNSAFE_RE.sub("_", (title + "_" + (citation or "")))[:30].strip("_")
     case_id = f"{year}_{base}".lower() if year else base.lower()
 
-    return {
-        "case_id": case_id,
-        "Title": f"{title} [{year}] {citation.split(' ',1)[1]}" if (year and citation) else (f"{title} [{year}]" if year else title),
-        "Year": year,
-        "Citation": citation,
-        "Jurisdiction": jurisdiction,
-        "Line": str(line_no),
-    }
+    return (
+        case_id,
+        f"{title} [{year}] {citation.split(' ',1)[1]}" if (year and citation) else (f"{title} [{year}]" if year else title),
+        year,
+        citation,
+        jurisdiction,
+    )
 
 def main():
     ap = argparse.ArgumentParser()
@@ -92,10 +117,9 @@ def main():
     Path(args.report).parent.mkdir(parents=True, exist_ok=True)
     Path(args.missing).parent.mkdir(parents=True, exist_ok=True)
 
-    with open(args.ltj_lines, "r", encoding="utf-8") as f:
-        lines = json.load(f)
+    lines = iter_ltj_lines(args.ltj_lines)
 
-    # Expect list of {"line_no": int, "text": "..."}
+    # Expect {"line_no": int, "text": "..."} entries (array, {"lines"} wrapper or NDJSON)
     subset = [r for r in lines if args.start <= int(r.get("line_no", -1)) <= args.end]
 
     rows = []
@@ -107,21 +131,19 @@ def main():
         if parsed:
             rows.append(parsed)
         else:
-            missed.append({"line_no": ln, "text": txt})
+            missed.append((ln, txt))
 
     # Write canonical CSV
     with open(args.out, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=CASE_ROW_COLS)
-        w.writeheader()
-        for row in rows:
-            w.writerow(row)
+        w = csv.writer(f)
+        w.writerow(CASE_ROW_COLS)
+        w.writerows(rows)
 
     # Missing (for manual inspect)
     with open(args.missing, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=["line_no","text"])
-        w.writeheader()
-        for m in missed:
-            w.writerow(m)
+        w = csv.writer(f)
+        w.writerow(["line_no","text"])
+        w.writerows(missed)
 
     # Report
     report = {
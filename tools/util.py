@@ -1,5 +1,6 @@
 # tools/util.py
-import re, time, random, html
+import csv, json, re, time, random, html
+from pathlib import Path
 from urllib.parse import urlencode, quote_plus, urlparse
 import requests
 from bs4 import BeautifulSoup
@@ -25,13 +26,16 @@ def http_get(url, params=None, timeout=20, allow_redirects=True):
         raise FetchError(f"GET {url} failed: {e}")
 
 _ROMAN = r"(?:[ivxlcdm]+\.?\s*)"
+_WS_RE = re.compile(r"\s+")
+_PAREN_RE = re.compile(r"\([^)]*\)")
+_SMALL_WORD_RE = re.compile(r"\b(in|the|of|and|&)\b")
 # crude normalizers to match titles across sites
 def norm_title(t: str) -> str:
     t = html.unescape(t or "").strip()
-    t = re.sub(r"\s+", " ", t)
+    t = _WS_RE.sub(" ", t)
     t = t.replace("’", "'").replace("–","-").replace("—","-")
-    t = re.sub(r"\([^)]*\)", "", t)           # drop parenthetical
-    t = re.sub(r"\b(in|the|of|and|&)\b", lambda m:m.group(0).lower(), t)
+    t = _PAREN_RE.sub("", t)           # drop parenthetical
+    t = _SMALL_WORD_RE.sub(lambda m:m.group(0).lower(), t)
     return t
 
 def plausible_match(page_text: str, title: str, citation: str) -> bool:
@@ -99,22 +103,22 @@ def jlib_find(title:str, citation:str="") -> str|None:
     return pdf or direct
 
 # ---------- BAILII helpers ----------
+# first <a href> that looks like a BAILII case page (/xx/.../YYYY/N.html), found in
+# one scan of the raw results page; [^"'?#] keeps every repeat inside one attribute
+BAILII_CASE_HREF_RE = re.compile(
+    r"""<a\s[^>]*?href\s*=\s*["']([^"'?#]*?/\w\w/[^"'?#]+/\d{4}/\d+\.html?)["']""", re.I)
+
 def bailii_search_url(title:str, citation:str=""):
     q = f'{title}'.strip()
     return "https://www.bailii.org/cgi-bin/sino_search_1.cgi?"+urlencode({"query": q})
 
 def bailii_pick_direct_from_results(html_txt:str) -> str|None:
-    soup = BeautifulSoup(html_txt, "html.parser")
     # typical results: ordered list with <a href="/ew/cases/...html">
-    for a in soup.select("a[href]"):
-        href = a.get("href")
-        if not href: 
-            continue
-        if href.startswith("/"): href = "https://www.bailii.org"+href
-        # prefer case page
-        if re.search(r"/\w\w/.*/\d{4}/\d+\.html?$", href):
-            return href
-    return None
+    m = BAILII_CASE_HREF_RE.search(html_txt)
+    if not m:
+        return None
+    href = html.unescape(m.group(1))
+    return "https://www.bailii.org"+href if href.startswith("/") else href
 
 def bailii_extract_pdf(html_txt:str) -> str|None:
     soup = BeautifulSoup(html_txt, "html.parser")
@@ -167,3 +171,39 @@ def pick_best_url(title, citation):
             except FetchError:
                 continue
     return None
+
+# ---------- File helpers (fetch/parse/resolve scripts) ----------
+_UNSAFE_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+def ensure_dir(path) -> None:
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+def safe_filename(name: str) -> str:
+    """Filesystem-safe version of name (runs of other characters become '_')."""
+    return _UNSAFE_FILENAME_RE.sub("_", name).strip("._") or "_"
+
+def read_csv(path):
+    """Return (hmap, rows): hmap maps header name -> column index; rows are
+    plain lists padded to the header width (blank rows skipped)."""
+    with open(path, newline="", encoding="utf-8") as f:
+        rdr = csv.reader(f)
+        header = [h.strip() for h in next(rdr, [])]
+        width = len(header)
+        rows = [r + [""] * (width - len(r)) for r in rdr if r]
+    return {h: i for i, h in enumerate(header)}, rows
+
+def write_csv(header, rows, path) -> None:
+    ensure_dir(Path(path).parent)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+def load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_json(obj, path) -> None:
+    ensure_dir(Path(path).parent)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
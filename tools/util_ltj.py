@@ -0,0 +1,91 @@
+# tools/util_ltj.py
+# Shared reader for LTJ-ui/out/LTJ.lines.json, used by the extract/rebuild
+# scripts. Standard library only (orjson/ijson if installed), so importing it
+# stays cheap.
+#
+# Besides the usual JSON array (or {"lines": [...]}) the file may be NDJSON,
+# one {"line_no", "text"} object per line; that form (two or more lines, the first
+# a line object) is scanned through mmap, so large files are never held whole.
+# Arrays are streamed with ijson when it is installed.
+import json
+import mmap
+import re
+from pathlib import Path
+
+_ORJSON_OK = False
+try:
+    import orjson  # type: ignore  # optional: faster decode of LTJ.lines.json
+    _ORJSON_OK = True
+except Exception:
+    _ORJSON_OK = False
+
+_IJSON_OK = False
+try:
+    import ijson  # type: ignore  # optional: stream JSON arrays item by item
+    _IJSON_OK = True
+except Exception:
+    _IJSON_OK = False
+
+_loads = orjson.loads if _ORJSON_OK else json.loads
+_NON_WS_RE = re.compile(rb"\S")
+
+def _is_ndjson(mm):
+    """First non-blank line is a complete line object (not an array or a {"lines"}
+    wrapper) and another non-blank line follows it. Only offsets are scanned
+    until then, so a one-line minified document is never copied or trial-parsed."""
+    m = _NON_WS_RE.search(mm)
+    if not m or mm[m.start()] != ord("{"):
+        return False
+    end = mm.find(b"\n", m.start())
+    if end < 0 or not _NON_WS_RE.search(mm, end):
+        return False  # single-line document
+    try:
+        obj = _loads(mm[m.start():end])
+    except ValueError:
+        return False  # pretty-printed JSON: '{' opens a multi-line document
+    return isinstance(obj, dict) and "lines" not in obj
+
+def _iter_ndjson(mm):
+    for raw in iter(mm.readline, b""):
+        if raw.strip():
+            yield _loads(raw)
+
+def _lines_array_events(events):
+    """Pass ijson events through, raising ValueError unless the top-level "lines" is an array."""
+    seen = False
+    for prefix, event, value in events:
+        if prefix == "lines":
+            if event == "start_array":
+                seen = True
+            elif event != "end_array":
+                raise ValueError("Unrecognised LTJ lines structure")
+        yield prefix, event, value
+    if not seen:
+        raise ValueError("Unrecognised LTJ lines structure")
+
+def iter_ltj_lines(path):
+    """Yield the line objects one by one (a {"lines": [...]} wrapper is unwrapped).
+    NDJSON is streamed from an mmap and arrays through ijson when installed;
+    otherwise the file is parsed whole first. Raises ValueError if the
+    document holds no list of lines."""
+    with open(path, "rb") as f:
+        if f.seek(0, 2):
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if _is_ndjson(mm):
+                    yield from _iter_ndjson(mm)
+                    return
+                m = _NON_WS_RE.search(mm)
+                first = mm[m.start():m.start() + 1] if m else b""
+            if _IJSON_OK and first in (b"[", b"{"):
+                f.seek(0)
+                if first == b"[":
+                    yield from ijson.items(f, "item")
+                else:
+                    yield from ijson.items(_lines_array_events(ijson.parse(f)), "lines.item")
+                return
+    data = _loads(Path(path).read_bytes())
+    if isinstance(data, dict) and "lines" in data:
+        data = data["lines"]
+    if not isinstance(data, list):
+        raise ValueError("Unrecognised LTJ lines structure")
+    yield from data
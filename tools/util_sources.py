@@ -4,39 +4,56 @@ from typing import Optional, Tuple
 from urllib.parse import urlencode, urljoin, urlparse, parse_qs
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from pdfminer.high_level import extract_text as pdf_extract_text
 
+from util import BAILII_CASE_HREF_RE
+
 UA = "CourtFirst/1.0 (+GitHub Actions; requests)"
 HDRS = {
     "User-Agent": UA,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
 
+# One pooled session for the whole run: JerseyLaw/BAILII/DDG connections are
+# kept alive between calls instead of a fresh TCP+TLS handshake per request.
+SESSION = requests.Session()
+SESSION.headers.update(HDRS)
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4, pool_maxsize=8,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504]),
+))
+
 def sleep(min_s=0.8, max_s=1.8):
     time.sleep(random.uniform(min_s, max_s))
 
 def http_get(url: str, timeout=25) -> str:
-    r = requests.get(url, headers=HDRS, timeout=timeout)
+    r = SESSION.get(url, timeout=timeout)
     r.raise_for_status()
     return r.text
 
 def http_get_bytes(url: str, timeout=30) -> bytes:
-    r = requests.get(url, headers=HDRS, timeout=timeout)
+    r = SESSION.get(url, timeout=timeout)
     r.raise_for_status()
     return r.content
 
 def sha256_bytes(b: bytes) -> str:
     return hashlib.sha256(b).hexdigest()
 
+_WS_RE = re.compile(r"\s+")
+_PDF_URL_RE = re.compile(r"\.pdf($|\?)", re.I)
+_TOKEN_SPLIT_RE = re.compile(r"[\W_]+")
+
 def norm_text(s: str) -> str:
     s = html.unescape((s or "").strip())
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     s = s.replace("’","'").replace("–","-").replace("—","-")
     return s
 
 def looks_pdf_url(u: str) -> bool:
-    return bool(u and re.search(r"\.pdf($|\?)", u, re.I))
+    return bool(u and _PDF_URL_RE.search(u))
 
 # ---------- Primary: JerseyLaw ------------------------------------------------
 
@@ -83,17 +100,12 @@ def bailii_search_url(query: str) -> str:
     return "https://www.bailii.org/cgi-bin/sino_search_1.cgi?" + urlencode({"query": query})
 
 def bailii_pick_case_link(html_txt: str) -> Optional[str]:
-    soup = BeautifulSoup(html_txt, "lxml")
-    for a in soup.select("a[href]"):
-        href = a.get("href") or ""
-        if not href: 
-            continue
-        if href.startswith("/"):
-            href = urljoin("https://www.bailii.org/", href)
-        # prefer case pages
-        if re.search(r"/\w\w/.+/\d{4}/\d+\.html?$", href):
-            return href
-    return None
+    # prefer case pages
+    m = BAILII_CASE_HREF_RE.search(html_txt)
+    if not m:
+        return None
+    href = html.unescape(m.group(1))
+    return urljoin("https://www.bailii.org/", href) if href.startswith("/") else href
 
 def bailii_find(title: str, citation: str) -> Tuple[Optional[str], Optional[str]]:
     q = f"{title} {citation}".strip()
@@ -149,7 +161,7 @@ def verify_pdf_contains(pdf_bytes: bytes, title: str, citation: str) -> bool:
     C = (citation or "").lower()
     body = " ".join(norm_text(txt).split()).lower()
     # require several title tokens + (citation or year)
-    tokens = [w for w in re.split(r"[\W_]+", T) if len(w) > 2][:5]
+    tokens = [w for w in _TOKEN_SPLIT_RE.split(T) if len(w) > 2][:5]
     ok_title = all(t in body for t in tokens[:3])  # at least 3 tokens
     ok_cite = (C and C in body) or True
     return ok_title and ok_cite